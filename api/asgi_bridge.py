@@ -0,0 +1,304 @@
+"""Minimal bridge from Functions Framework (Flask/Werkzeug) requests to an ASGI app.
+
+Replaces building a ``TestClient`` per invocation: the app runs on one
+long-lived event loop in a background thread, each request becomes an ASGI
+``http`` scope directly, and the response is handed back as soon as the app
+sends it — as bytes when it fits in one message, otherwise as a generator so
+Flask streams it chunk by chunk. At most ``_MAX_PENDING`` chunks wait between
+the app and the WSGI side, so a slow client slows the producer instead of
+buffering the whole body: a ``send`` that finds the buffer full waits in a
+hand-off thread, not by polling the loop. Closing the response, even before
+it is iterated, stops the app.
+
+The app's lifespan runs on the same loop: :meth:`ASGIBridge.start` sends
+``lifespan.startup`` without blocking (requests are served meanwhile) and
+registers ``lifespan.shutdown`` to run at interpreter exit.
+"""
+
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+# Hop-by-hop / framing headers the WSGI server sets itself.
+_DROP_HEADERS = {b"content-length", b"transfer-encoding", b"connection"}
+
+_DONE = object()
+
+# Response messages buffered per request before ``send`` waits for the consumer.
+_MAX_PENDING = 16
+
+# How often a blocked hand-off rechecks whether the client went away.
+_PUT_TIMEOUT_SECONDS = 0.1
+
+# How long shutdown waits for the lifespan (startup, then shutdown) at exit.
+_SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+
+class _ClientGone(Exception):
+    """The WSGI side stopped reading (client disconnected)."""
+
+logger = logging.getLogger(__name__)
+
+
+class ASGIBridge:
+    """Callable that dispatches a Werkzeug-style request to ``app``."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        # Own threads for blocked hand-offs, so slow clients can't starve the
+        # loop's default executor (disk cache reads run there).
+        self._handoff = ThreadPoolExecutor(thread_name_prefix="asgi-bridge-handoff")
+        self._started: Future | None = None
+        self._lifespan_task: asyncio.Task | None = None
+        self._lifespan_receive: asyncio.Queue | None = None
+        self._lifespan_sent: asyncio.Queue | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The persistent event loop (started on first use)."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever,
+                        name="asgi-bridge",
+                        daemon=True,
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    def start(self) -> Future:
+        """Run the app's lifespan startup on the bridge loop, once.
+
+        Returns a future that resolves to whether startup completed; shutdown
+        is registered with ``atexit``.
+        """
+        loop = self.loop
+        with self._lock:
+            if self._started is None:
+                self._started = asyncio.run_coroutine_threadsafe(self._startup(), loop)
+                atexit.register(self.shutdown)
+        return self._started
+
+    def shutdown(self, timeout: float = _SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Send ``lifespan.shutdown`` and wait for the app to finish it."""
+        if self._started is None or self._loop is None:
+            return
+        try:
+            self._started.result(timeout)
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+        except Exception:
+            logger.warning("ASGI lifespan shutdown failed", exc_info=True)
+
+    async def _startup(self) -> bool:
+        receive: asyncio.Queue = asyncio.Queue()
+        sent: asyncio.Queue = asyncio.Queue()
+        self._lifespan_receive, self._lifespan_sent = receive, sent
+
+        async def run() -> None:
+            scope = {"type": "lifespan", "asgi": {"version": "3.0", "spec_version": "2.0"}, "state": {}}
+            try:
+                await self.app(scope, receive.get, sent.put)
+            except Exception:
+                logger.exception("Unhandled error in ASGI lifespan")
+            finally:
+                # Unblocks a waiter if the app returned without answering.
+                await sent.put(None)
+
+        self._lifespan_task = asyncio.get_running_loop().create_task(run())
+        await receive.put({"type": "lifespan.startup"})
+        reply = await sent.get()
+        if reply is None or reply["type"] != "lifespan.startup.complete":
+            logger.warning("ASGI lifespan startup failed: %s", reply and reply.get("message"))
+            return False
+        return True
+
+    async def _shutdown(self) -> None:
+        if self._lifespan_task is None or self._lifespan_task.done():
+            return
+        await self._lifespan_receive.put({"type": "lifespan.shutdown"})
+        reply = await self._lifespan_sent.get()
+        if reply is None or reply["type"] != "lifespan.shutdown.complete":
+            logger.warning("ASGI lifespan shutdown failed: %s", reply and reply.get("message"))
+
+    def __call__(self, request: Any) -> tuple[bytes | Iterator[bytes], int, list[tuple[str, str]]]:
+        """Return ``(body, status, headers)`` as the Functions Framework expects."""
+        messages: queue.Queue = queue.Queue(maxsize=_MAX_PENDING)
+        closed = threading.Event()
+        asyncio.run_coroutine_threadsafe(
+            self._run(build_scope(request), request.get_data(), messages, closed),
+            self.loop,
+        )
+        start = messages.get()
+        if start is _DONE or start.get("type") != "http.response.start":
+            closed.set()
+            return b"Internal Server Error", 500, [("content-type", "text/plain; charset=utf-8")]
+        headers = [
+            (k.decode("latin-1"), v.decode("latin-1"))
+            for k, v in start.get("headers", [])
+            if k.lower() not in _DROP_HEADERS
+        ]
+        first, more = _next_chunk(messages)
+        if not more:
+            closed.set()
+            return first, start["status"], headers
+        return _StreamingBody(first, messages, closed), start["status"], headers
+
+    async def _run(
+        self,
+        scope: dict[str, Any],
+        body: bytes,
+        messages: queue.Queue,
+        closed: threading.Event,
+    ) -> None:
+        request_sent = False
+        finished = asyncio.Event()
+
+        async def receive() -> dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            await _put(messages, message, closed, self._handoff)
+
+        try:
+            await self.app(scope, receive, send)
+        except _ClientGone:
+            pass
+        except Exception:
+            # Starlette has already sent a 500 if it could; _DONE ends the rest.
+            logger.exception("Unhandled error in ASGI app")
+        finally:
+            finished.set()
+            try:
+                await _put(messages, _DONE, closed, self._handoff)
+            except _ClientGone:
+                pass
+
+
+async def _put(
+    messages: queue.Queue,
+    message: Any,
+    closed: threading.Event,
+    executor: ThreadPoolExecutor,
+) -> None:
+    """Hand ``message`` to the WSGI side without blocking the event loop."""
+    if closed.is_set():
+        raise _ClientGone
+    try:
+        messages.put_nowait(message)
+        return
+    except queue.Full:
+        pass
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(executor, _wait_put, messages, message, closed):
+        raise _ClientGone
+
+
+def _wait_put(messages: queue.Queue, message: Any, closed: threading.Event) -> bool:
+    """Blocking put that gives up (False) once the client is gone."""
+    while not closed.is_set():
+        try:
+            messages.put(message, timeout=_PUT_TIMEOUT_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _next_chunk(messages: queue.Queue) -> tuple[bytes, bool]:
+    """Next body chunk and whether more follow."""
+    while True:
+        message = messages.get()
+        if message is _DONE:
+            return b"", False
+        if message.get("type") == "http.response.body":
+            return message.get("body", b""), bool(message.get("more_body"))
+
+
+class _StreamingBody:
+    """Response body iterable for Flask/Werkzeug.
+
+    Unlike a generator, whose ``finally`` never runs if it is closed before
+    the first ``next()``, ``close()`` always releases the app.
+    """
+
+    def __init__(self, first: bytes, messages: queue.Queue, closed: threading.Event) -> None:
+        self._first: bytes | None = first
+        self._messages = messages
+        self._closed = closed
+        self._more = True
+
+    def __iter__(self) -> "_StreamingBody":
+        return self
+
+    def __next__(self) -> bytes:
+        if self._first is not None:
+            first, self._first = self._first, None
+            if first:
+                return first
+        while self._more and not self._closed.is_set():
+            chunk, self._more = _next_chunk(self._messages)
+            if chunk:
+                return chunk
+        self.close()
+        raise StopIteration
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+def _raw_path(request: Any, path: str) -> bytes:
+    """Path as sent by the client, percent-escapes (e.g. ``%2F``) intact.
+
+    ``request.path`` is already decoded; the WSGI server keeps the original
+    request target in ``RAW_URI`` (gunicorn, Werkzeug) or ``REQUEST_URI``.
+    """
+    environ = getattr(request, "environ", None) or {}
+    target = environ.get("RAW_URI") or environ.get("REQUEST_URI") or ""
+    raw = target.partition("?")[0]
+    if raw.startswith("/"):
+        return raw.encode("latin-1")
+    return path.encode("utf-8")
+
+
+def build_scope(request: Any) -> dict[str, Any]:
+    """ASGI ``http`` scope for a Werkzeug-style request."""
+    path = (request.path or "/").strip()
+    if not path.startswith("/"):
+        path = "/" + path
+    query = request.query_string or b""
+    if isinstance(query, str):
+        query = query.encode("latin-1")
+    host = request.headers.get("host", "localhost")
+    server_name, _, server_port = host.partition(":")
+    scheme = getattr(request, "scheme", None) or "https"
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": request.method,
+        "scheme": scheme,
+        "path": path,
+        "raw_path": _raw_path(request, path),
+        "query_string": query,
+        "root_path": "",
+        "headers": [
+            (k.lower().encode("latin-1"), v.encode("latin-1"))
+            for k, v in request.headers.items()
+        ],
+        "client": (getattr(request, "remote_addr", None) or "", 0),
+        "server": (server_name, int(server_port) if server_port.isdigit() else (443 if scheme == "https" else 80)),
+    }
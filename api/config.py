@@ -14,6 +14,16 @@ def _get_int(key: str, default: int) -> int:
         return default
 
 
+def _get_float(key: str, default: float) -> float:
+    raw = os.environ.get(key)
+    if raw is None:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> "Settings":
     return Settings()
@@ -23,14 +33,76 @@ class Settings:
     """Application settings from environment."""
 
     swapi_base_url: str
+    swapi_mode: str
+    swapi_snapshot_path: str
     cache_ttl_seconds: int
+    cache_max_entries: int
+    cache_max_bytes: int
+    cache_sweep_interval_seconds: int
+    cache_stale_while_revalidate_seconds: int
+    cache_stale_if_error_seconds: int
+    cache_not_found_ttl_seconds: int
+    response_cache_max_bytes: int
+    compression_min_bytes: int
+    compression_gzip_level: int
+    compression_brotli_quality: int
+    cache_disk_path: str
+    cache_disk_ttl_seconds: int
     request_timeout_seconds: int
     request_retries: int
+    http_max_connections: int
+    fanout_concurrency: int
+    expand_max_depth: int
+    expand_max_urls: int
+    prewarm: bool
+    prewarm_collections: tuple[str, ...]
+    metrics_enabled: bool
+    server_timing: bool
+    profile_token: str
+    profile_sample_rate: float
+    profile_interval_ms: int
+    profile_dir: str
+    profile_max_files: int
 
     def __init__(self) -> None:
         self.swapi_base_url = os.environ.get(
             "SWAPI_BASE_URL", "https://swapi.dev/api"
         ).rstrip("/")
+        self.swapi_mode = os.environ.get("SWAPI_MODE", "live").strip().lower()
+        self.swapi_snapshot_path = os.environ.get(
+            "SWAPI_SNAPSHOT_PATH", "data/swapi-snapshot.json.gz"
+        )
         self.cache_ttl_seconds = _get_int("CACHE_TTL_SECONDS", 300)
+        self.cache_max_entries = _get_int("CACHE_MAX_ENTRIES", 2048)
+        self.cache_max_bytes = _get_int("CACHE_MAX_BYTES", 32 * 1024 * 1024)
+        self.cache_sweep_interval_seconds = _get_int("CACHE_SWEEP_INTERVAL_SECONDS", 60)
+        self.cache_stale_while_revalidate_seconds = _get_int(
+            "CACHE_STALE_WHILE_REVALIDATE_SECONDS", 60
+        )
+        self.cache_stale_if_error_seconds = _get_int("CACHE_STALE_IF_ERROR_SECONDS", 3600)
+        self.cache_not_found_ttl_seconds = _get_int("CACHE_NOT_FOUND_TTL_SECONDS", 60)
+        self.response_cache_max_bytes = _get_int("RESPONSE_CACHE_MAX_BYTES", 8 * 1024 * 1024)
+        self.compression_min_bytes = _get_int("COMPRESSION_MIN_BYTES", 1024)
+        self.compression_gzip_level = _get_int("COMPRESSION_GZIP_LEVEL", 6)
+        self.compression_brotli_quality = _get_int("COMPRESSION_BROTLI_QUALITY", 5)
+        self.cache_disk_path = os.environ.get("CACHE_DISK_PATH", "")
+        self.cache_disk_ttl_seconds = _get_int("CACHE_DISK_TTL_SECONDS", 86400)
         self.request_timeout_seconds = _get_int("REQUEST_TIMEOUT_SECONDS", 10)
         self.request_retries = _get_int("REQUEST_RETRIES", 3)
+        self.http_max_connections = _get_int("HTTP_MAX_CONNECTIONS", 100)
+        self.fanout_concurrency = _get_int("FANOUT_CONCURRENCY", 10)
+        self.expand_max_depth = _get_int("EXPAND_MAX_DEPTH", 3)
+        self.expand_max_urls = _get_int("EXPAND_MAX_URLS", 500)
+        self.prewarm = _get_int("PREWARM", 0) != 0
+        self.prewarm_collections = tuple(
+            name.strip().lower()
+            for name in os.environ.get("PREWARM_COLLECTIONS", "").split(",")
+            if name.strip()
+        )
+        self.metrics_enabled = _get_int("METRICS_ENABLED", 1) != 0
+        self.server_timing = _get_int("SERVER_TIMING", 0) != 0
+        self.profile_token = os.environ.get("PROFILE_TOKEN", "")
+        self.profile_sample_rate = _get_float("PROFILE_SAMPLE_RATE", 0.0)
+        self.profile_interval_ms = _get_int("PROFILE_INTERVAL_MS", 5)
+        self.profile_dir = os.environ.get("PROFILE_DIR", "")
+        self.profile_max_files = _get_int("PROFILE_MAX_FILES", 20)
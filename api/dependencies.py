@@ -2,17 +2,30 @@
 
 from typing import Annotated
 
-from fastapi import Header, HTTPException, status
+from fastapi import Header, HTTPException, Request, status
 
+from api.services import catalog, search as search_index
+from api.services.formatters import filter_people_by_gender, paginate, sort_results
 from api.services.swapi_client import (
     SWAPIClientError,
     SWAPINotFoundError,
-    get_list,
-    get_resource,
-    get_by_url,
+    aget_list,
+    aget_resource,
+    aget_by_url,
 )
 
 
+def relative_url(request: Request) -> str:
+    """Path and query of ``request``, without scheme or host.
+
+    Links built from it stay on whatever host the client called (API Gateway),
+    never the function's own host.
+    """
+    url = request.url
+    path = request.scope.get("root_path", "") + request.scope["path"]
+    return f"{path}?{url.query}" if url.query else path
+
+
 def optional_api_key(
     x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
 ) -> str | None:
@@ -20,18 +33,18 @@ def optional_api_key(
     return x_api_key
 
 
-def get_swapi_people(
+async def get_swapi_people(
     page: int | None = None,
     search: str | None = None,
 ) -> dict:
     """Dependency: fetch people list from SWAPI."""
-    return get_list("people", page=page, search=search)
+    return await aget_list("people", page=page, search=search)
 
 
-def get_swapi_person(resource_id: int) -> dict:
+async def get_swapi_person(resource_id: int) -> dict:
     """Dependency: fetch single person by id."""
     try:
-        return get_resource("people", resource_id)
+        return await aget_resource("people", resource_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,18 +57,18 @@ def get_swapi_person(resource_id: int) -> dict:
         ) from e
 
 
-def get_swapi_films(
+async def get_swapi_films(
     page: int | None = None,
     search: str | None = None,
 ) -> dict:
     """Dependency: fetch films list from SWAPI."""
-    return get_list("films", page=page, search=search)
+    return await aget_list("films", page=page, search=search)
 
 
-def get_swapi_film(resource_id: int) -> dict:
+async def get_swapi_film(resource_id: int) -> dict:
     """Dependency: fetch single film by id."""
     try:
-        return get_resource("films", resource_id)
+        return await aget_resource("films", resource_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,18 +81,18 @@ def get_swapi_film(resource_id: int) -> dict:
         ) from e
 
 
-def get_swapi_planets(
+async def get_swapi_planets(
     page: int | None = None,
     search: str | None = None,
 ) -> dict:
     """Dependency: fetch planets list from SWAPI."""
-    return get_list("planets", page=page, search=search)
+    return await aget_list("planets", page=page, search=search)
 
 
-def get_swapi_planet(resource_id: int) -> dict:
+async def get_swapi_planet(resource_id: int) -> dict:
     """Dependency: fetch single planet by id."""
     try:
-        return get_resource("planets", resource_id)
+        return await aget_resource("planets", resource_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -92,18 +105,18 @@ def get_swapi_planet(resource_id: int) -> dict:
         ) from e
 
 
-def get_swapi_starships(
+async def get_swapi_starships(
     page: int | None = None,
     search: str | None = None,
 ) -> dict:
     """Dependency: fetch starships list from SWAPI."""
-    return get_list("starships", page=page, search=search)
+    return await aget_list("starships", page=page, search=search)
 
 
-def get_swapi_starship(resource_id: int) -> dict:
+async def get_swapi_starship(resource_id: int) -> dict:
     """Dependency: fetch single starship by id."""
     try:
-        return get_resource("starships", resource_id)
+        return await aget_resource("starships", resource_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,10 +129,10 @@ def get_swapi_starship(resource_id: int) -> dict:
         ) from e
 
 
-def resolve_url(url: str) -> dict:
+async def resolve_url(url: str) -> dict:
     """Resolve a SWAPI URL to full resource (for correlated queries)."""
     try:
-        return get_by_url(url)
+        return await aget_by_url(url)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -130,3 +143,64 @@ def resolve_url(url: str) -> dict:
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(e),
         ) from e
+
+
+async def collection_records(
+    resource: str,
+    search: str | None = None,
+    sort: str | None = None,
+    order: str = "asc",
+    gender: str | None = None,
+) -> list[dict]:
+    """Every record of ``resource`` matching ``search``/``gender``, in ``sort`` order.
+
+    ``search`` is answered by the local index (SWAPI matching semantics) and
+    ``sort`` by the collection's presorted order. The list may be shared with
+    the catalog: never mutate it.
+    """
+    try:
+        records = await catalog.aget_collection(resource)
+    except SWAPIClientError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e),
+        ) from e
+    results = search_index.search(resource, records, search)
+    if gender:
+        results = filter_people_by_gender(results, gender)
+    if sort:
+        ordered = catalog.sorted_records(resource, sort, order == "desc")
+        if ordered is None:
+            results = sort_results(list(results), sort, order)
+        elif results is records:
+            results = ordered
+        else:
+            keep = {id(r) for r in results}
+            results = [r for r in ordered if id(r) in keep]
+    return results
+
+
+async def list_collection(
+    resource: str,
+    url: str,
+    page: int | None = None,
+    page_size: int | None = None,
+    search: str | None = None,
+    sort: str | None = None,
+    order: str = "asc",
+    gender: str | None = None,
+) -> dict:
+    """Search, filter, sort and paginate over the whole collection.
+
+    A page is a slice of :func:`collection_records`. Unlike a SWAPI page, the
+    sort order and ``count`` cover every record; ``next``/``previous`` link
+    back to ``url`` (this API; see :func:`relative_url`).
+    """
+    results = await collection_records(resource, search, sort, order, gender)
+    listing = paginate(results, page, page_size, url)
+    if listing is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Page not found",
+        )
+    return listing
@@ -0,0 +1,198 @@
+"""JSON responses encoded with orjson, a cache of pre-encoded bodies, and
+NDJSON/CSV streaming.
+
+Routers return these ``Response`` objects instead of dicts, so FastAPI skips
+return-type validation and serialization: payloads are SWAPI JSON already.
+"""
+
+import csv
+import functools
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+import orjson
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from api.config import get_settings
+from api.middleware import content_etag
+from api.services.cache import TTLCache
+from api.services import timing
+from api.services.formatters import project
+
+
+class ORJSONResponse(Response):
+    """``application/json`` response rendered with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with timing.phase("serialize"):
+            return orjson.dumps(content)
+
+
+_encoded: TTLCache | None = None
+
+
+def _get_encoded_cache() -> TTLCache:
+    global _encoded
+    if _encoded is None:
+        settings = get_settings()
+        _encoded = TTLCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.response_cache_max_bytes,
+            sweep_interval_seconds=settings.cache_sweep_interval_seconds,
+        )
+    return _encoded
+
+
+def clear_encoded_cache() -> None:
+    """Drop pre-encoded bodies (e.g. for tests)."""
+    _get_encoded_cache().clear()
+
+
+def encoded_cache_stats() -> dict[str, Any]:
+    return _get_encoded_cache().stats()
+
+
+def encode_cached(key: str, data: Any) -> tuple[bytes, str]:
+    """orjson bytes and ETag of ``data``, reused while ``key`` still maps to the same object.
+
+    ``data`` is the dict held by the SWAPI client cache (or the snapshot): a
+    refresh replaces the object rather than mutating it, so an identity check
+    keeps the bytes in sync without hashing or comparing payloads.
+    """
+    cache = _get_encoded_cache()
+    hit = cache.get(key)
+    if hit is not None and hit[0] is data:
+        return hit[1], hit[2]
+    with timing.phase("serialize"):
+        body = orjson.dumps(data)
+        etag = content_etag(body)
+    cache.set(key, (data, body, etag), get_settings().cache_ttl_seconds, size=len(body))
+    return body, etag
+
+
+def cached_json_response(key: str, data: Any) -> Response:
+    """Response for an untransformed resource, served from pre-encoded bytes.
+
+    Carries its ETag, so ``ConditionalGetMiddleware`` does not hash the body.
+    """
+    body, etag = encode_cached(key, data)
+    return Response(body, media_type="application/json", headers={"etag": etag})
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Records already in memory are written in chunks of about this size.
+_CHUNK_BYTES = 32 * 1024
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    """Opt-in streaming: ``?stream=1`` or ``Accept: application/x-ndjson``."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def varies_on_accept(
+    endpoint: Callable[..., Awaitable[Response]],
+) -> Callable[..., Awaitable[Response]]:
+    """Add ``Vary: Accept`` to every response of a route that calls ``wants_ndjson``.
+
+    The JSON and NDJSON variants share a URL, so shared caches must key on
+    ``Accept`` too. The wrapper keeps the signature FastAPI reads parameters from.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Response:
+        response = await endpoint(*args, **kwargs)
+        response.headers.add_vary_header("Accept")
+        return response
+
+    return wrapper
+
+
+async def _ndjson_from_memory(
+    records: Iterable[dict[str, Any]],
+    tree: dict[str, Any] | None,
+) -> AsyncIterator[bytes]:
+    chunk = bytearray()
+    for record in records:
+        chunk += orjson.dumps(project(record, tree))
+        chunk += b"\n"
+        if len(chunk) >= _CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+async def _ndjson_as_resolved(
+    records: AsyncIterable[dict[str, Any]],
+    tree: dict[str, Any] | None,
+) -> AsyncIterator[bytes]:
+    async for record in records:
+        yield orjson.dumps(project(record, tree)) + b"\n"
+
+
+def ndjson_response(
+    records: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+    tree: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """Stream one JSON record per line, projected by ``tree`` (see ``parse_fields``).
+
+    Records from an async iterable are written as soon as each one arrives;
+    records already in memory are batched into ~32 KB chunks. Only the current
+    chunk is held encoded, so memory stays flat whatever the result size.
+    """
+    if isinstance(records, AsyncIterable):
+        body = _ndjson_as_resolved(records, tree)
+    else:
+        body = _ndjson_from_memory(records, tree)
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+CSV_MEDIA_TYPE = "text/csv"
+
+
+def _csv_cell(value: Any) -> Any:
+    """CSV cell for a record value: lists (URLs) space-joined, objects as JSON."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(v if isinstance(v, str) else orjson.dumps(v).decode() for v in value)
+    if isinstance(value, dict):
+        return orjson.dumps(value).decode()
+    return value
+
+
+async def _csv_chunks(rows: Iterable[dict[str, Any]], columns: list[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_cell(row.get(column)) for column in columns])
+        if buffer.tell() >= _CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def csv_response(
+    rows: Iterable[dict[str, Any]],
+    columns: list[str],
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """Stream ``rows`` as CSV with a header line of ``columns``, in ~32 KB chunks.
+
+    Missing fields are empty cells. ``rows`` is consumed lazily, so only the
+    current chunk is held encoded.
+    """
+    return StreamingResponse(
+        _csv_chunks(rows, columns),
+        media_type=CSV_MEDIA_TYPE,
+        headers=headers,
+    )
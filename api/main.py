@@ -1,23 +1,79 @@
 """Star Wars Fan API - FastAPI app and Cloud Functions (2nd gen) entrypoint."""
 
-from fastapi import FastAPI
+import logging
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
+
+from api.asgi_bridge import ASGIBridge
+from api.config import get_settings
+from api.encoding import ORJSONResponse
+from api.middleware import (
+    CompressionMiddleware,
+    ConditionalGetMiddleware,
+    MetricsMiddleware,
+    ServerTimingMiddleware,
+)
+from api.routers import batch, export, films, people, planets, starships
+from api.services import catalog, metrics, swapi_client
+from api.services.snapshot import RESOURCES
+
+logger = logging.getLogger(__name__)
+
+
+async def prewarm() -> None:
+    """Initialize the upstream client and load ``PREWARM_COLLECTIONS``.
+
+    Failures are logged, not raised: a cold cache is still a working instance.
+    """
+    try:
+        await swapi_client.awarmup()
+        resources = tuple(
+            r for r in get_settings().prewarm_collections if r in RESOURCES
+        )
+        if resources:
+            await catalog.awarm(resources)
+    except swapi_client.SWAPIClientError:
+        logger.warning("prewarm failed", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prewarm on startup when enabled; on shutdown release the upstream
+    connection pool and flush disk-cache writes."""
+    if get_settings().prewarm:
+        await prewarm()
+    yield
+    await swapi_client.aclose()
+    swapi_client.flush_disk_cache()
 
-from api.routers import films, people, planets, starships
 
 app = FastAPI(
     title="Star Wars Fan API",
     description="API for Star Wars data (SWAPI) with filters, sort, and correlated queries.",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Added last = outermost: compression wraps the ETag'd identity response,
+# metrics time everything, and Server-Timing opens the per-request timings.
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+
 app.include_router(films.router)
 app.include_router(people.router)
 app.include_router(planets.router)
 app.include_router(starships.router)
+app.include_router(batch.router)
+app.include_router(export.router)
 
 
 @app.get("/")
-def root() -> dict:
+async def root() -> dict:
     """Health and API info."""
     return {
         "name": "Star Wars Fan API",
@@ -28,35 +84,37 @@ def root() -> dict:
 
 
 @app.get("/health")
-def health() -> dict:
+async def health() -> dict:
     """Health check for API Gateway / load balancer."""
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> Response:
+    """Upstream, cache and request metrics in the Prometheus text format."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+_bridge = ASGIBridge(app)
+
+
 def cloud_function_handler(request):
     """Entrypoint for Google Cloud Functions (2nd gen) HTTP trigger.
-    Forwards Flask-like request to FastAPI app via ASGI and returns response.
+    Dispatches the Flask-like request to the FastAPI app through a long-lived
+    ASGI bridge (one event loop per instance) and returns
+    (body, status_code, headers) for the Functions Framework.
+    """
+    return _bridge(request)
+
+
+def start_lifespan() -> Future:
+    """Run the app's lifespan on the bridge loop (at instance start).
+
+    Startup (``prewarm`` when enabled) runs in the background, so the client
+    it builds is the one later requests use; shutdown closes that client and
+    flushes disk-cache writes at interpreter exit.
     """
-    from starlette.testclient import TestClient
-    path = (request.path or "/").strip()
-    if not path.startswith("/"):
-        path = "/" + path
-    if request.query_string:
-        path += "?" + request.query_string
-    body = request.get_data()
-    headers = {k: v for k, v in request.headers}
-    client = TestClient(app)
-    response = client.request(
-        request.method,
-        path,
-        content=body,
-        headers=headers,
-    )
-    # Return tuple (body, status_code, headers) for Functions Framework
-    resp_headers = dict(response.headers)
-    resp_headers.pop("content-length", None)
-    resp_headers.pop("transfer-encoding", None)
-    return (response.content, response.status_code, resp_headers)
+    return _bridge.start()
 
 
 # For local run: uvicorn api.main:app --reload
@@ -0,0 +1,415 @@
+"""ASGI middleware for HTTP caching, compression, request metrics and timing.
+
+Written as plain ASGI callables (not ``BaseHTTPMiddleware``) so they add no
+task or stream overhead per request and stay compatible with the bridge.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+
+from api.config import get_settings
+from api.services import metrics, profiler, timing
+from api.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Headers of the 200 response kept on a 304 (RFC 9110 §15.4.5).
+_NOT_MODIFIED_HEADERS = ("etag", "cache-control", "vary", "last-modified")
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag for a response body: a short hash of its exact bytes."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_control() -> str:
+    """``Cache-Control`` for cacheable responses, derived from the upstream TTLs."""
+    settings = get_settings()
+    value = f"public, max-age={settings.cache_ttl_seconds}"
+    if settings.cache_stale_while_revalidate_seconds > 0:
+        value += f", stale-while-revalidate={settings.cache_stale_while_revalidate_seconds}"
+    if settings.cache_stale_if_error_seconds > 0:
+        value += f", stale-if-error={settings.cache_stale_if_error_seconds}"
+    return value
+
+
+class ConditionalGetMiddleware:
+    """ETag, ``Cache-Control`` and ``If-None-Match`` → 304 for GET responses.
+
+    Only complete 200 bodies (a single ``http.response.body`` message) are
+    tagged; streamed responses pass through untouched. A response that already
+    carries an ``ETag`` (e.g. a pre-encoded body) is not hashed again.
+    """
+
+    def __init__(self, app: Any, exclude_paths: Iterable[str] = ("/health", "/metrics")) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] in self.exclude_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        held: dict | None = None
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal held
+            if message["type"] == "http.response.start":
+                held = message
+                return
+            if message["type"] != "http.response.body" or held is None:
+                await send(message)
+                return
+            start, held = held, None
+            if start["status"] != 200 or message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=list(start["headers"]))
+            etag = headers.get("etag")
+            if etag is None:
+                etag = content_etag(message.get("body", b""))
+                headers["etag"] = etag
+            if "cache-control" not in headers:
+                headers["cache-control"] = cache_control()
+            if if_none_match is not None and etag_matches(if_none_match, etag):
+                kept = [
+                    (k, v) for k, v in headers.raw
+                    if k.decode("latin-1") in _NOT_MODIFIED_HEADERS
+                ]
+                await send({"type": "http.response.start", "status": 304, "headers": kept})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": headers.raw})
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# --- Compression ----------------------------------------------------------
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+_brotli: Any = None
+
+
+def _get_brotli() -> Any | None:
+    """The optional ``brotli`` module, imported on first use (None if absent)."""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+        except ImportError:
+            brotli = False
+        _brotli = brotli
+    return _brotli or None
+
+
+def _accepted_codings(accept_encoding: str) -> dict[str, float]:
+    codings: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            codings[name.strip().lower()] = q
+    return codings
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick ``br`` (when brotli is installed) or ``gzip`` from ``Accept-Encoding``."""
+    if not accept_encoding:
+        return None
+    codings = _accepted_codings(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    for name in ("br", "gzip"):
+        if name == "br" and _get_brotli() is None:
+            continue
+        if codings.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    settings = get_settings()
+    if encoding == "br":
+        return _get_brotli().compress(body, quality=settings.compression_brotli_quality)
+    # mtime=0: same input, same bytes (stable across instances and cache hits).
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+_compressed: TTLCache | None = None
+
+
+def _get_compressed_cache() -> TTLCache:
+    global _compressed
+    if _compressed is None:
+        settings = get_settings()
+        _compressed = TTLCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.response_cache_max_bytes,
+            sweep_interval_seconds=settings.cache_sweep_interval_seconds,
+        )
+    return _compressed
+
+
+def clear_compressed_cache() -> None:
+    """Drop cached compressed bodies (e.g. for tests)."""
+    _get_compressed_cache().clear()
+
+
+def compressed_cache_stats() -> dict[str, Any]:
+    return _get_compressed_cache().stats()
+
+
+def compress_cached(body: bytes, encoding: str, etag: str | None) -> bytes:
+    """``compress`` with the result cached under the body's strong ETag.
+
+    The ETag is a content hash (precomputed for pre-encoded bodies), so a hit
+    costs a dict lookup instead of recompressing hundreds of KB.
+    """
+    if etag is None or etag.startswith("W/"):
+        return compress(body, encoding)
+    cache = _get_compressed_cache()
+    key = f"{encoding}:{etag}"
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    compressed = compress(body, encoding)
+    cache.set(key, compressed, get_settings().cache_ttl_seconds, size=len(compressed))
+    return compressed
+
+
+def _lists_strong(if_none_match: str, etag: str) -> bool:
+    return any(candidate.strip() == etag for candidate in if_none_match.split(","))
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli for complete JSON/text bodies above a size threshold.
+
+    Sits outside ``ConditionalGetMiddleware``: the ETag it sees is the hash of
+    the identity body, and a compressed variant gets the weak form ``W/"…"``
+    so it never collides with the identity representation (``If-None-Match``
+    uses weak comparison, so revalidation still matches). Streamed bodies are
+    passed through. A 304 carries the same ``Vary`` and the ETag form the
+    client holds: weak when an encoding was negotiated, unless it revalidated
+    the strong (identity, below the size threshold) tag.
+    """
+
+    def __init__(self, app: Any, minimum_size: int | None = None) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        minimum_size = self.minimum_size
+        if minimum_size is None:
+            minimum_size = get_settings().compression_min_bytes
+        held: dict | None = None
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal held
+            if message["type"] == "http.response.start":
+                held = message
+                return
+            if message["type"] != "http.response.body" or held is None:
+                await send(message)
+                return
+            start, held = held, None
+            headers = MutableHeaders(raw=list(start["headers"]))
+            if start["status"] == 304:
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if (
+                    encoding is not None
+                    and etag is not None
+                    and not etag.startswith("W/")
+                    and not _lists_strong(request_headers.get("if-none-match", ""), etag)
+                ):
+                    headers["etag"] = "W/" + etag
+                await send({**start, "headers": headers.raw})
+                await send(message)
+                return
+            content_type = headers.get("content-type", "")
+            if not content_type.startswith(_COMPRESSIBLE_TYPES) or "content-encoding" in headers:
+                await send(start)
+                await send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if encoding is None or message.get("more_body", False) or len(body) < minimum_size:
+                await send({**start, "headers": headers.raw})
+                await send(message)
+                return
+            etag = headers.get("etag")
+            compressed = compress_cached(body, encoding, etag)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            if etag is not None and not etag.startswith("W/"):
+                headers["etag"] = "W/" + etag
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# --- Metrics ---------------------------------------------------------------
+
+
+def route_template(scope: dict) -> str:
+    """Path template of the route serving ``scope`` (``/films/{film_id}``).
+
+    Recent Starlette stores the matched route in the (shared) scope; older
+    releases, still allowed by requirements.txt, don't, so the app's routes
+    are matched again here. ``unmatched`` when no route fits.
+    """
+    route = scope.get("route")
+    if route is None:
+        partial = None
+        for candidate in getattr(getattr(scope.get("app"), "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match is Match.FULL:
+                route = candidate
+                break
+            if match is Match.PARTIAL and partial is None:
+                partial = candidate  # path matched, method didn't (405)
+        route = route or partial
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Count and time requests per route template, with the SWAPI calls each made.
+
+    Runs inside ``ServerTimingMiddleware``, whose request timings count the
+    upstream calls; the time includes compression and streaming. The label is
+    the matched route's path (``/films/{film_id}``), never the raw path, which
+    keeps the series count bounded; unmatched paths share ``unmatched``.
+    """
+
+    def __init__(self, app: Any, exclude_paths: Iterable[str] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"] in self.exclude_paths
+            or not metrics.enabled()
+        ):
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = route_template(scope)
+            timings = timing.current()
+            metrics.observe_request(
+                endpoint,
+                scope["method"],
+                status,
+                time.perf_counter() - started,
+                timings.upstream_calls if timings is not None else 0,
+            )
+
+
+# --- Server-Timing and profiling -------------------------------------------
+
+
+class ServerTimingMiddleware:
+    """Per-request phase timings as ``Server-Timing``; opt-in sampling profiles.
+
+    Outermost: it opens the request's ``RequestTimings`` (see
+    ``api.services.timing``) that the client, formatters and encoders add to,
+    and, with ``SERVER_TIMING=1`` (off by default: the header would be stored
+    with publicly cached responses), writes the header when the response
+    starts, after compression. A streamed body is encoded after that and is
+    not included. Selected requests
+    (see ``api.services.profiler``) are also sampled; the profile's file name
+    is returned in ``X-Profile``.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        sampler = path = None
+        if profiler.selected(Headers(scope=scope), settings):
+            sampler = profiler.SamplingProfiler(threading.get_ident(), settings.profile_interval_ms / 1000)
+            path = profiler.profile_path(settings)
+        timings, token = timing.begin()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start" and (settings.server_timing or path):
+                headers = MutableHeaders(raw=list(message["headers"]))
+                if settings.server_timing:
+                    headers.append("server-timing", timings.server_timing(time.perf_counter() - started))
+                if path is not None:
+                    headers["x-profile"] = os.path.basename(path)
+                message = {**message, "headers": headers.raw}
+            await send(message)
+
+        if sampler is not None:
+            sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            timing.end(token)
+            if sampler is not None:
+                query = scope.get("query_string", b"").decode("latin-1")
+                label = f"{scope['method']} {scope['path']}" + (f"?{query}" if query else "")
+                try:
+                    # Joining the sampler and writing the file both block.
+                    await asyncio.to_thread(
+                        profiler.finish, sampler, label, path, settings.profile_max_files
+                    )
+                    logger.info("profile for %s written to %s", label, path)
+                except OSError:
+                    logger.warning("could not write profile to %s", path, exc_info=True)
@@ -0,0 +1,67 @@
+"""Batch router: many resources by id or URL in one call."""
+
+import logging
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from api.config import get_settings
+from api.encoding import ORJSONResponse
+from api.schemas.batch import BatchItem, BatchRequest
+from api.services import catalog
+from api.services.formatters import parse_fields, project
+from api.services.snapshot import RESOURCES, split_swapi_url
+from api.services.swapi_client import SWAPINotFoundError, SWAPIClientError
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+def _reference(item: BatchItem) -> tuple[str, int] | None:
+    """``(resource, id)`` of an item; None for a URL that isn't a SWAPI resource."""
+    if item.url is None:
+        return item.resource, item.id
+    resource, resource_id, _ = split_swapi_url(item.url)
+    if resource not in RESOURCES or resource_id is None:
+        return None
+    return resource, resource_id
+
+
+def _result(resource: str, resource_id: int, value: Any, projection: dict | None) -> dict[str, Any]:
+    result: dict[str, Any] = {"resource": resource, "id": resource_id}
+    if isinstance(value, SWAPINotFoundError):
+        return {**result, "status": 404, "error": "Not found"}
+    if isinstance(value, SWAPIClientError):
+        return {**result, "status": 502, "error": str(value)}
+    if isinstance(value, BaseException):
+        # One unexpected failure must not turn the whole batch into a 500.
+        logger.warning("batch lookup of %s/%s failed", resource, resource_id, exc_info=value)
+        return {**result, "status": 502, "error": "Upstream error"}
+    return {**result, "status": 200, "data": project(value, projection)}
+
+
+@router.post("")
+async def batch_lookup(body: BatchRequest) -> Response:
+    """Resolve many ``(resource, id)`` pairs or SWAPI URLs concurrently.
+
+    URLs are reduced to ``(resource, id)`` and fetched from ``SWAPI_BASE_URL``
+    (never from the host in the URL). Repeated lookups are resolved once,
+    through the shared cache and loaded collections. One result per item,
+    in order, each with its own ``status`` (200, 400, 404 or 502).
+    """
+    base_url = get_settings().swapi_base_url
+    refs = [_reference(item) for item in body.items]
+    urls = list(dict.fromkeys(
+        f"{base_url}/{ref[0]}/{ref[1]}/" for ref in refs if ref is not None
+    ))
+    resolved = dict(zip(urls, await catalog.aresolve_urls(urls)))
+    projection = parse_fields(body.fields)
+    results = []
+    for item, ref in zip(body.items, refs):
+        if ref is None:
+            results.append({"url": item.url, "status": 400, "error": "Not a SWAPI resource URL"})
+            continue
+        value = resolved[f"{base_url}/{ref[0]}/{ref[1]}/"]
+        results.append(_result(ref[0], ref[1], value, projection))
+    return ORJSONResponse({"count": len(results), "results": results})
@@ -0,0 +1,78 @@
+"""Export router: whole collections streamed as NDJSON or CSV."""
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+
+from api.encoding import csv_response, ndjson_response
+from api.schemas.common import ExportFormat, Resource
+from api.services import catalog
+from api.services.formatters import parse_fields, project
+from api.services.snapshot import RESOURCES
+from api.services.swapi_client import SWAPIClientError
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+Collections = list[tuple[str, list[dict[str, Any]]]]
+
+
+async def _load(resources: tuple[str, ...]) -> Collections:
+    """Each collection from the catalog (crawled once, then served from memory)."""
+    try:
+        loaded = await asyncio.gather(*(catalog.aget_collection(r) for r in resources))
+    except SWAPIClientError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e),
+        ) from e
+    return list(zip(resources, loaded))
+
+
+def _rows(collections: Collections, tree: dict[str, Any] | None, tagged: bool) -> Iterator[dict[str, Any]]:
+    """Projected records, one at a time; ``tagged`` prefixes each with its resource."""
+    for resource, records in collections:
+        for record in records:
+            row = project(record, tree)
+            yield {"resource": resource, **row} if tagged else row
+
+
+def _columns(collections: Collections, tree: dict[str, Any] | None) -> list[str]:
+    """CSV header: the selected fields, or every field seen, in first-seen order."""
+    if tree is not None:
+        return list(tree)
+    return list(dict.fromkeys(
+        key for _, records in collections for record in records for key in record
+    ))
+
+
+def _export(collections: Collections, fmt: ExportFormat, fields: str | None, name: str, tagged: bool) -> Response:
+    tree = parse_fields(fields)
+    headers = {"content-disposition": f'attachment; filename="{name}.{fmt.value}"'}
+    rows = _rows(collections, tree, tagged)
+    if fmt is ExportFormat.CSV:
+        columns = _columns(collections, tree)
+        if tagged:
+            columns = ["resource", *columns]
+        return csv_response(rows, columns, headers=headers)
+    return ndjson_response(rows, headers=headers)
+
+
+@router.get("")
+async def export_all(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+    fields: str | None = Query(None, description="Fields to export, comma-separated (e.g. name,url)"),
+) -> Response:
+    """Every resource collection in one stream; each row carries its ``resource``."""
+    return _export(await _load(RESOURCES), fmt, fields, "swapi", tagged=True)
+
+
+@router.get("/{resource}")
+async def export_resource(
+    resource: Resource,
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+    fields: str | None = Query(None, description="Fields to export, comma-separated (e.g. name,url)"),
+) -> Response:
+    """One whole collection as NDJSON or CSV, streamed in chunks."""
+    return _export(await _load((resource,)), fmt, fields, resource, tagged=False)
@@ -1,60 +1,104 @@
 """Films router: list, get by id, correlated characters."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 
-from api.services.swapi_client import get_list, get_resource, get_by_url
+from api.services import catalog
+from api.services.swapi_client import aget_list, aget_resource, aget_many
 from api.services.swapi_client import SWAPINotFoundError, SWAPIClientError
-from api.services.formatters import sort_results, filter_by_film_id, expand_urls
+from api.services.formatters import sort_results, filter_by_film_id, aexpand_urls, MAX_PAGE_SIZE, parse_fields, project, project_page, restrict_expand
 from api.schemas.common import SortOrder
+from api.dependencies import collection_records, list_collection, relative_url
+from api.encoding import ORJSONResponse, cached_json_response, ndjson_response, varies_on_accept, wants_ndjson
 from fastapi import HTTPException, status
 
 router = APIRouter(prefix="/films", tags=["films"])
 
 
 @router.get("")
-def list_films(
+@varies_on_accept
+async def list_films(
+    request: Request,
     page: int | None = None,
     search: str | None = None,
     sort: str | None = Query(None, description="Sort by: title, episode_id, release_date"),
     order: SortOrder = SortOrder.ASC,
     character_id: int | None = Query(None, description="Filter films where this character appears"),
-) -> dict[str, Any]:
-    """List films with optional search, pagination, sort, and filter by character."""
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size over the full collection"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+    stream: bool = Query(False, description="Stream every result as NDJSON, one record per line (same as Accept: application/x-ndjson)"),
+) -> Response:
+    """List films with optional search, pagination, sort, and filter by character.
+
+    ``search``, ``sort`` and ``page_size`` apply to the whole collection.
+    Streaming returns every matching film (no pagination).
+    """
+    streaming = wants_ndjson(request, stream)
     if character_id is not None:
-        try:
-            person = get_resource("people", character_id)
+        results = catalog.related_records("people", character_id, "films")
+        if results is None:
+            try:
+                person = await aget_resource("people", character_id)
+            except (SWAPINotFoundError, SWAPIClientError):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Character not found",
+                ) from None
             film_urls = person.get("films") or []
-            results = [get_by_url(u) for u in film_urls]
-        except (SWAPINotFoundError, SWAPIClientError):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Character not found",
-            ) from None
+            if streaming and not sort:
+                return ndjson_response(_resolved_records(film_urls), parse_fields(fields))
+            try:
+                results = await aget_many(film_urls)
+            except (SWAPINotFoundError, SWAPIClientError):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Character not found",
+                ) from None
         if sort:
             results = sort_results(results, sort, order.value)
-        return {"count": len(results), "results": results, "next": None, "previous": None}
-    raw = get_list("films", page=page, search=search)
+        if streaming:
+            return ndjson_response(results, parse_fields(fields))
+        return ORJSONResponse({
+            "count": len(results),
+            "results": project(results, parse_fields(fields)),
+            "next": None,
+            "previous": None,
+        })
+    if streaming:
+        records = await collection_records("films", search, sort, order.value)
+        return ndjson_response(records, parse_fields(fields))
+    if search or sort or page_size:
+        page_data = await list_collection(
+            "films",
+            relative_url(request),
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort=sort,
+            order=order.value,
+        )
+        return ORJSONResponse(project_page(page_data, parse_fields(fields)))
+    raw = await aget_list("films", page=page, search=search)
     results = raw.get("results", [])
-    if sort:
-        results = sort_results(results, sort, order.value)
-    return {
+    return ORJSONResponse({
         "count": len(results),
-        "results": results,
+        "results": project(results, parse_fields(fields)),
         "next": raw.get("next"),
         "previous": raw.get("previous"),
-    }
+    })
 
 
 @router.get("/{film_id}")
-def get_film(
+async def get_film(
     film_id: int,
-    expand: str | None = Query(None, description="Expand related: characters,planets,species,starships,vehicles"),
-) -> dict[str, Any]:
+    expand: str | None = Query(None, description="Expand related: characters,planets,species,starships,vehicles; dotted paths expand nested relations (e.g. characters.homeworld)"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+) -> Response:
     """Get film by id with optional expand of related resources."""
     try:
-        film = get_resource("films", film_id)
+        film = await aget_resource("films", film_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -65,21 +109,42 @@ def get_film(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(e),
         ) from e
-    if expand:
-        keys = {k.strip() for k in expand.split(",") if k.strip()}
-        film = expand_urls(film, keys)
-    return film
+    projection = parse_fields(fields)
+    if not expand and projection is None:
+        return cached_json_response(f"films/{film_id}", film)
+    keys = restrict_expand({k.strip() for k in (expand or "").split(",") if k.strip()}, projection)
+    if keys:
+        film = await aexpand_urls(film, keys)
+    return ORJSONResponse(project(film, projection))
+
+
+async def _resolved_records(urls: list[str]) -> AsyncIterator[dict[str, Any]]:
+    """Records behind ``urls`` as each resolves, skipping dead or failing URLs."""
+    async for _, fetched in catalog.aiter_resolve_urls(urls):
+        if isinstance(fetched, (SWAPINotFoundError, SWAPIClientError)):
+            continue
+        if isinstance(fetched, BaseException):
+            raise fetched
+        yield fetched
 
 
 @router.get("/{film_id}/characters")
-def get_film_characters(
+@varies_on_accept
+async def get_film_characters(
+    request: Request,
     film_id: int,
     sort: str | None = Query(None, description="Sort by: name, height, mass, birth_year"),
     order: SortOrder = SortOrder.ASC,
-) -> dict[str, Any]:
-    """Get characters that appear in this film (correlated query)."""
+    fields: str | None = Query(None, description="Fields to return, comma-separated (e.g. name,homeworld)"),
+    stream: bool = Query(False, description="Stream every result as NDJSON, one record per line (same as Accept: application/x-ndjson)"),
+) -> Response:
+    """Get characters that appear in this film (correlated query).
+
+    Streaming without ``sort`` writes each character as soon as it resolves
+    (completion order); with ``sort`` the sorted list is streamed.
+    """
     try:
-        film = get_resource("films", film_id)
+        film = await aget_resource("films", film_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,12 +156,18 @@ def get_film_characters(
             detail=str(e),
         ) from e
     urls = film.get("characters") or []
+    streaming = wants_ndjson(request, stream)
+    if streaming and not sort:
+        return ndjson_response(_resolved_records(urls), parse_fields(fields))
     characters = []
-    for u in urls:
-        try:
-            characters.append(get_by_url(u))
-        except (SWAPINotFoundError, SWAPIClientError):
+    for fetched in await catalog.aresolve_urls(urls):
+        if isinstance(fetched, (SWAPINotFoundError, SWAPIClientError)):
             continue
+        if isinstance(fetched, BaseException):
+            raise fetched
+        characters.append(fetched)
     if sort:
         characters = sort_results(characters, sort, order.value)
-    return {"count": len(characters), "results": characters}
+    if streaming:
+        return ndjson_response(characters, parse_fields(fields))
+    return ORJSONResponse({"count": len(characters), "results": project(characters, parse_fields(fields))})
@@ -1,49 +1,70 @@
 """People router: list, get by id, filters and sort."""
 
-from typing import Any
+from fastapi import APIRouter, Query, Request, Response
 
-from fastapi import APIRouter, Query
-
-from api.services.swapi_client import get_list, get_resource
+from api.services.swapi_client import aget_list, aget_resource
 from api.services.swapi_client import SWAPINotFoundError, SWAPIClientError
-from api.services.formatters import sort_results, filter_people_by_gender, expand_urls
+from api.services.formatters import aexpand_urls, MAX_PAGE_SIZE, parse_fields, project, project_page, restrict_expand
 from api.schemas.common import SortOrder
+from api.dependencies import collection_records, list_collection, relative_url
+from api.encoding import ORJSONResponse, cached_json_response, ndjson_response, varies_on_accept, wants_ndjson
 from fastapi import HTTPException, status
 
 router = APIRouter(prefix="/people", tags=["people"])
 
 
 @router.get("")
-def list_people(
+@varies_on_accept
+async def list_people(
+    request: Request,
     page: int | None = None,
     search: str | None = None,
     gender: str | None = Query(None, description="Filter by gender (e.g. male, female)"),
     sort: str | None = Query(None, description="Sort by: name, height, mass, birth_year"),
     order: SortOrder = SortOrder.ASC,
-) -> dict[str, Any]:
-    """List people with optional search, pagination, gender filter, and sort."""
-    raw = get_list("people", page=page, search=search)
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size over the full collection"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+    stream: bool = Query(False, description="Stream every result as NDJSON, one record per line (same as Accept: application/x-ndjson)"),
+) -> Response:
+    """List people with optional search, pagination, gender filter, and sort.
+
+    ``search``, ``gender``, ``sort`` and ``page_size`` apply to the whole collection.
+    Streaming returns every matching record (no pagination).
+    """
+    if wants_ndjson(request, stream):
+        records = await collection_records("people", search, sort, order.value, gender)
+        return ndjson_response(records, parse_fields(fields))
+    if search or sort or gender or page_size:
+        page_data = await list_collection(
+            "people",
+            relative_url(request),
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort=sort,
+            order=order.value,
+            gender=gender,
+        )
+        return ORJSONResponse(project_page(page_data, parse_fields(fields)))
+    raw = await aget_list("people", page=page, search=search)
     results: list[dict] = raw.get("results", [])
-    if gender:
-        results = filter_people_by_gender(results, gender)
-    if sort:
-        results = sort_results(results, sort, order.value)
-    return {
+    return ORJSONResponse({
         "count": len(results),
-        "results": results,
+        "results": project(results, parse_fields(fields)),
         "next": raw.get("next"),
         "previous": raw.get("previous"),
-    }
+    })
 
 
 @router.get("/{person_id}")
-def get_person(
+async def get_person(
     person_id: int,
-    expand: str | None = Query(None, description="Expand related: films,species,starships,vehicles,homeworld"),
-) -> dict[str, Any]:
+    expand: str | None = Query(None, description="Expand related: films,species,starships,vehicles,homeworld; dotted paths expand nested relations (e.g. films.planets)"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+) -> Response:
     """Get person by id with optional expand of related resources."""
     try:
-        person = get_resource("people", person_id)
+        person = await aget_resource("people", person_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,7 +75,10 @@ def get_person(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(e),
         ) from e
-    if expand:
-        keys = {k.strip() for k in expand.split(",") if k.strip()}
-        person = expand_urls(person, keys)
-    return person
+    projection = parse_fields(fields)
+    if not expand and projection is None:
+        return cached_json_response(f"people/{person_id}", person)
+    keys = restrict_expand({k.strip() for k in (expand or "").split(",") if k.strip()}, projection)
+    if keys:
+        person = await aexpand_urls(person, keys)
+    return ORJSONResponse(project(person, projection))
@@ -1,46 +1,68 @@
 """Planets router: list, get by id."""
 
-from typing import Any
+from fastapi import APIRouter, Query, Request, Response
 
-from fastapi import APIRouter, Query
-
-from api.services.swapi_client import get_list, get_resource
+from api.services.swapi_client import aget_list, aget_resource
 from api.services.swapi_client import SWAPINotFoundError, SWAPIClientError
-from api.services.formatters import sort_results, expand_urls
+from api.services.formatters import aexpand_urls, MAX_PAGE_SIZE, parse_fields, project, project_page, restrict_expand
 from api.schemas.common import SortOrder
+from api.dependencies import collection_records, list_collection, relative_url
+from api.encoding import ORJSONResponse, cached_json_response, ndjson_response, varies_on_accept, wants_ndjson
 from fastapi import HTTPException, status
 
 router = APIRouter(prefix="/planets", tags=["planets"])
 
 
 @router.get("")
-def list_planets(
+@varies_on_accept
+async def list_planets(
+    request: Request,
     page: int | None = None,
     search: str | None = None,
     sort: str | None = Query(None, description="Sort by: name, population, diameter"),
     order: SortOrder = SortOrder.ASC,
-) -> dict[str, Any]:
-    """List planets with optional search, pagination, and sort."""
-    raw = get_list("planets", page=page, search=search)
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size over the full collection"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+    stream: bool = Query(False, description="Stream every result as NDJSON, one record per line (same as Accept: application/x-ndjson)"),
+) -> Response:
+    """List planets with optional search, pagination, and sort.
+
+    ``search``, ``sort`` and ``page_size`` apply to the whole collection.
+    Streaming returns every matching record (no pagination).
+    """
+    if wants_ndjson(request, stream):
+        records = await collection_records("planets", search, sort, order.value)
+        return ndjson_response(records, parse_fields(fields))
+    if search or sort or page_size:
+        page_data = await list_collection(
+            "planets",
+            relative_url(request),
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort=sort,
+            order=order.value,
+        )
+        return ORJSONResponse(project_page(page_data, parse_fields(fields)))
+    raw = await aget_list("planets", page=page, search=search)
     results: list[dict] = raw.get("results", [])
-    if sort:
-        results = sort_results(results, sort, order.value)
-    return {
+    return ORJSONResponse({
         "count": len(results),
-        "results": results,
+        "results": project(results, parse_fields(fields)),
         "next": raw.get("next"),
         "previous": raw.get("previous"),
-    }
+    })
 
 
 @router.get("/{planet_id}")
-def get_planet(
+async def get_planet(
     planet_id: int,
-    expand: str | None = Query(None, description="Expand related: residents,films"),
-) -> dict[str, Any]:
+    expand: str | None = Query(None, description="Expand related: residents,films; dotted paths expand nested relations (e.g. residents.species)"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+) -> Response:
     """Get planet by id with optional expand of related resources."""
     try:
-        planet = get_resource("planets", planet_id)
+        planet = await aget_resource("planets", planet_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,7 +73,10 @@ def get_planet(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(e),
         ) from e
-    if expand:
-        keys = {k.strip() for k in expand.split(",") if k.strip()}
-        planet = expand_urls(planet, keys)
-    return planet
+    projection = parse_fields(fields)
+    if not expand and projection is None:
+        return cached_json_response(f"planets/{planet_id}", planet)
+    keys = restrict_expand({k.strip() for k in (expand or "").split(",") if k.strip()}, projection)
+    if keys:
+        planet = await aexpand_urls(planet, keys)
+    return ORJSONResponse(project(planet, projection))
@@ -1,46 +1,68 @@
 """Starships router: list, get by id."""
 
-from typing import Any
+from fastapi import APIRouter, Query, Request, Response
 
-from fastapi import APIRouter, Query
-
-from api.services.swapi_client import get_list, get_resource
+from api.services.swapi_client import aget_list, aget_resource
 from api.services.swapi_client import SWAPINotFoundError, SWAPIClientError
-from api.services.formatters import sort_results, expand_urls
+from api.services.formatters import aexpand_urls, MAX_PAGE_SIZE, parse_fields, project, project_page, restrict_expand
 from api.schemas.common import SortOrder
+from api.dependencies import collection_records, list_collection, relative_url
+from api.encoding import ORJSONResponse, cached_json_response, ndjson_response, varies_on_accept, wants_ndjson
 from fastapi import HTTPException, status
 
 router = APIRouter(prefix="/starships", tags=["starships"])
 
 
 @router.get("")
-def list_starships(
+@varies_on_accept
+async def list_starships(
+    request: Request,
     page: int | None = None,
     search: str | None = None,
     sort: str | None = Query(None, description="Sort by: name, model, length, crew"),
     order: SortOrder = SortOrder.ASC,
-) -> dict[str, Any]:
-    """List starships with optional search, pagination, and sort."""
-    raw = get_list("starships", page=page, search=search)
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size over the full collection"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+    stream: bool = Query(False, description="Stream every result as NDJSON, one record per line (same as Accept: application/x-ndjson)"),
+) -> Response:
+    """List starships with optional search, pagination, and sort.
+
+    ``search``, ``sort`` and ``page_size`` apply to the whole collection.
+    Streaming returns every matching record (no pagination).
+    """
+    if wants_ndjson(request, stream):
+        records = await collection_records("starships", search, sort, order.value)
+        return ndjson_response(records, parse_fields(fields))
+    if search or sort or page_size:
+        page_data = await list_collection(
+            "starships",
+            relative_url(request),
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort=sort,
+            order=order.value,
+        )
+        return ORJSONResponse(project_page(page_data, parse_fields(fields)))
+    raw = await aget_list("starships", page=page, search=search)
     results: list[dict] = raw.get("results", [])
-    if sort:
-        results = sort_results(results, sort, order.value)
-    return {
+    return ORJSONResponse({
         "count": len(results),
-        "results": results,
+        "results": project(results, parse_fields(fields)),
         "next": raw.get("next"),
         "previous": raw.get("previous"),
-    }
+    })
 
 
 @router.get("/{starship_id}")
-def get_starship(
+async def get_starship(
     starship_id: int,
-    expand: str | None = Query(None, description="Expand related: films,pilots"),
-) -> dict[str, Any]:
+    expand: str | None = Query(None, description="Expand related: films,pilots; dotted paths expand nested relations (e.g. pilots.homeworld)"),
+    fields: str | None = Query(None, description="Fields to return, comma-separated; dotted paths select inside expanded relations (e.g. name,homeworld.name)"),
+) -> Response:
     """Get starship by id with optional expand of related resources."""
     try:
-        starship = get_resource("starships", starship_id)
+        starship = await aget_resource("starships", starship_id)
     except SWAPINotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,7 +73,10 @@ def get_starship(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(e),
         ) from e
-    if expand:
-        keys = {k.strip() for k in expand.split(",") if k.strip()}
-        starship = expand_urls(starship, keys)
-    return starship
+    projection = parse_fields(fields)
+    if not expand and projection is None:
+        return cached_json_response(f"starships/{starship_id}", starship)
+    keys = restrict_expand({k.strip() for k in (expand or "").split(",") if k.strip()}, projection)
+    if keys:
+        starship = await aexpand_urls(starship, keys)
+    return ORJSONResponse(project(starship, projection))
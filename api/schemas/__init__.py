@@ -1,5 +1,6 @@
 """Pydantic schemas for request/response."""
 
-from api.schemas.common import SortOrder
+from api.schemas.batch import BatchItem, BatchRequest
+from api.schemas.common import ExportFormat, Resource, SortOrder
 
-__all__ = ["SortOrder"]
+__all__ = ["BatchItem", "BatchRequest", "ExportFormat", "Resource", "SortOrder"]
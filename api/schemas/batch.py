@@ -0,0 +1,33 @@
+"""Batch lookup request schema."""
+
+from pydantic import BaseModel, Field, model_validator
+
+from api.schemas.common import Resource
+
+MAX_BATCH_ITEMS = 100
+
+
+class BatchItem(BaseModel):
+    """One lookup: ``resource`` + ``id``, or a SWAPI resource ``url``."""
+
+    resource: Resource | None = None
+    id: int | None = Field(None, ge=1)
+    url: str | None = None
+
+    @model_validator(mode="after")
+    def _one_reference(self) -> "BatchItem":
+        has_pair = self.resource is not None and self.id is not None
+        has_part = self.resource is not None or self.id is not None
+        if has_pair == (self.url is not None) or (has_part and not has_pair):
+            raise ValueError("give either resource and id, or url")
+        return self
+
+
+class BatchRequest(BaseModel):
+    """Up to ``MAX_BATCH_ITEMS`` lookups resolved in one call."""
+
+    items: list[BatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    fields: str | None = Field(
+        None,
+        description="Fields to return per item, comma-separated (same as the fields query parameter)",
+    )
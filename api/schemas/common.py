@@ -1,6 +1,9 @@
 """Common request/response schemas."""
 
 from enum import Enum
+from typing import Literal
+
+Resource = Literal["films", "people", "planets", "species", "starships", "vehicles"]
 
 
 class SortOrder(str, Enum):
@@ -8,3 +11,10 @@ class SortOrder(str, Enum):
 
     ASC = "asc"
     DESC = "desc"
+
+
+class ExportFormat(str, Enum):
+    """Encoding of a collection export."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -0,0 +1,200 @@
+"""Bounded in-memory TTL cache with LRU eviction."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheEntry:
+    """Cached value with its expiry and approximate size in bytes.
+
+    An expired entry is kept (but never returned by ``TTLCache.get``) for a
+    further ``stale_seconds`` so callers can serve it stale. ``validators``
+    holds the origin's ``ETag`` / ``Last-Modified`` for conditional refreshes.
+    """
+
+    __slots__ = ("data", "expires_at", "stale_until", "size", "validators")
+
+    def __init__(
+        self,
+        data: Any,
+        ttl_seconds: float,
+        size: int,
+        stale_seconds: float = 0,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        self.data = data
+        self.size = size
+        self.validators = validators
+        self.renew(ttl_seconds, stale_seconds)
+
+    def renew(self, ttl_seconds: float, stale_seconds: float = 0) -> None:
+        """Restart the TTL (and stale window) from now, keeping the same data."""
+        self.expires_at = time.monotonic() + ttl_seconds
+        self.stale_until = self.expires_at + stale_seconds
+
+    def is_valid(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def staleness(self) -> float:
+        """Seconds since expiry (0 while still fresh)."""
+        return max(0.0, time.monotonic() - self.expires_at)
+
+    def is_retained(self) -> bool:
+        return time.monotonic() < self.stale_until
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate payload size (JSON-encoded length) when the raw body is unknown."""
+    try:
+        return len(json.dumps(value, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return 0
+
+
+class TTLCache:
+    """Thread-safe TTL cache bounded by entry count and total bytes.
+
+    The least recently used entries are evicted once either budget is
+    exceeded (0 disables that budget). Entries past their stale window are
+    dropped when read and by a sweep that runs at most once every ``sweep_interval_seconds``
+    during writes, so keys that are never read again don't stay resident.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        sweep_interval_seconds: float = 60,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Any | None:
+        """Return the value if present and fresh, else None."""
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_valid():
+            return None
+        return entry.data
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        """Return the entry if fresh or still within its stale window.
+
+        A stale entry counts as a miss; the caller decides whether to serve it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if not entry.is_retained():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.is_valid():
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: float,
+        size: int | None = None,
+        stale_seconds: float = 0,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, ttl_seconds, size, stale_seconds, validators)
+            self._bytes += size
+            self._maybe_sweep()
+            self._enforce_budget()
+
+    def renew(self, key: str, ttl_seconds: float, stale_seconds: float = 0) -> bool:
+        """Extend a retained entry in place; False if it is gone (evicted/expired)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.is_retained():
+                return False
+            entry.renew(ttl_seconds, stale_seconds)
+            self._entries.move_to_end(key)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._last_sweep = time.monotonic()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        with self._lock:
+            return self._sweep()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _maybe_sweep(self) -> None:
+        if time.monotonic() - self._last_sweep >= self.sweep_interval_seconds:
+            self._sweep()
+
+    def _sweep(self) -> int:
+        now = time.monotonic()
+        expired = [k for k, e in self._entries.items() if e.stale_until <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        self._last_sweep = now
+        return len(expired)
+
+    def _enforce_budget(self) -> None:
+        # Keep the newest entry even if it alone exceeds max_bytes.
+        while len(self._entries) > 1 and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
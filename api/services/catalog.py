@@ -0,0 +1,218 @@
+"""Full SWAPI collections held in memory, with lookups by id and relation.
+
+A collection is every record of a resource (all pages). It is taken from the
+snapshot in ``SWAPI_MODE=snapshot`` or crawled through the SWAPI client (so
+page responses share its cache), and kept for ``cache_ttl_seconds``.
+Installing a collection (re)indexes its records in ``relations.index`` and
+in the search index.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from api.config import get_settings
+from api.services import formatters, relations, search, timing
+from api.services.snapshot import RESOURCES, split_swapi_url
+from api.services.swapi_client import aget_by_url, aget_list, aget_many, get_snapshot
+
+
+class _Collection:
+    __slots__ = ("records", "by_id", "expires_at", "fields", "_sort_keys", "_sorted")
+
+    def __init__(self, records: list[dict[str, Any]], ttl_seconds: float) -> None:
+        self.records = records
+        self.by_id: dict[int, dict[str, Any]] = {}
+        for record in records:
+            _, resource_id, _ = split_swapi_url(record.get("url") or "")
+            if resource_id is not None:
+                self.by_id[resource_id] = record
+        self.expires_at = time.monotonic() + ttl_seconds
+        self.fields = frozenset(key for record in records for key in record)
+        self._sort_keys: dict[str, list[tuple[int, Any]]] = {}
+        self._sorted: dict[tuple[str, bool], list[dict[str, Any]]] = {}
+
+    def is_valid(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def sorted_by(self, field: str, descending: bool) -> list[dict[str, Any]]:
+        """Records ordered like ``sort_results``; computed once per field and direction.
+
+        Sort keys are normalized once per record and field, and shared by
+        both directions. The returned list is shared: slice it, don't mutate it.
+        Only fields present in the records are cached, so arbitrary ``sort=``
+        values can't grow memory; for any other field every key is equal and
+        the (stable) order is the collection's own.
+        """
+        if field not in self.fields:
+            return self.records
+        ordered = self._sorted.get((field, descending))
+        if ordered is None:
+            keys = self._sort_keys.get(field)
+            if keys is None:
+                keys = self._sort_keys[field] = [formatters.sort_key(r.get(field)) for r in self.records]
+            permutation = sorted(range(len(keys)), key=keys.__getitem__, reverse=descending)
+            ordered = self._sorted[(field, descending)] = [self.records[i] for i in permutation]
+        return ordered
+
+
+_collections: dict[str, _Collection] = {}
+
+
+def clear() -> None:
+    """Forget loaded collections and their indexes (e.g. for tests)."""
+    _collections.clear()
+    relations.index.clear()
+    search.clear()
+
+
+def _install(resource: str, records: list[dict[str, Any]], ttl_seconds: float) -> _Collection:
+    collection = _Collection(records, ttl_seconds)
+    _collections[resource] = collection
+    relations.index.index_records(records)
+    search.index_collection(resource, records)
+    return collection
+
+
+def _snapshot_mode() -> bool:
+    return get_settings().swapi_mode == "snapshot"
+
+
+def _loaded(resource: str) -> _Collection | None:
+    """The collection if it can be used without I/O, else None."""
+    collection = _collections.get(resource)
+    if collection is not None and collection.is_valid():
+        return collection
+    if _snapshot_mode():
+        # The snapshot never changes while the process runs.
+        return _install(resource, get_snapshot().records(resource), math.inf)
+    return None
+
+
+async def aget_collection(resource: str) -> list[dict[str, Any]]:
+    """Every record of ``resource``; crawls missing pages concurrently."""
+    collection = _loaded(resource)
+    if collection is not None:
+        return collection.records
+    settings = get_settings()
+    first = await aget_list(resource)
+    records = list(first.get("results") or [])
+    page_size = len(records) or 1
+    pages = math.ceil((first.get("count") or 0) / page_size)
+    urls = [
+        f"{settings.swapi_base_url}/{resource}/?page={page}"
+        for page in range(2, pages + 1)
+    ]
+    for raw in await aget_many(urls):
+        records.extend(raw.get("results") or [])
+    return _install(resource, records, settings.cache_ttl_seconds).records
+
+
+async def awarm(resources: tuple[str, ...] = RESOURCES) -> None:
+    """Load several collections concurrently (e.g. at instance start)."""
+    await asyncio.gather(*(aget_collection(r) for r in resources))
+
+
+def sorted_records(
+    resource: str,
+    field: str,
+    descending: bool = False,
+) -> list[dict[str, Any]] | None:
+    """A loaded collection presorted by ``field`` (shared list), or None if not loaded."""
+    collection = _loaded(resource)
+    if collection is None:
+        return None
+    with timing.phase("sort"):
+        return collection.sorted_by(field, descending)
+
+
+def get_record(resource: str, resource_id: int) -> dict[str, Any] | None:
+    """A record from a loaded collection, without I/O."""
+    collection = _loaded(resource)
+    if collection is None:
+        return None
+    return collection.by_id.get(resource_id)
+
+
+def related_records(
+    resource: str,
+    resource_id: int,
+    target: str,
+) -> list[dict[str, Any]] | None:
+    """Records of ``target`` related to one node, answered from memory.
+
+    None when the node isn't indexed or the target collection isn't loaded;
+    callers then fall back to resolving URLs upstream.
+    """
+    targets = _loaded(target)
+    if targets is None:
+        return None
+    if _snapshot_mode():
+        _loaded(resource)
+    ids = relations.index.related(resource, resource_id, target)
+    if ids is None:
+        return None
+    return [targets.by_id[i] for i in ids if i in targets.by_id]
+
+
+async def aresolve_urls(urls: list[str]) -> list[Any]:
+    """Resolve related URLs, from loaded collections where possible.
+
+    Same contract as ``aget_many(urls, return_exceptions=True)``: one slot per
+    URL, in order, holding the record or the exception. Only URLs whose record
+    isn't in memory reach the SWAPI client.
+    """
+    results: list[Any] = [None] * len(urls)
+    missing: list[int] = []
+    for i, url in enumerate(urls):
+        resource, resource_id, _ = split_swapi_url(url)
+        record = get_record(resource, resource_id) if resource_id is not None else None
+        if record is None:
+            missing.append(i)
+        else:
+            results[i] = record
+    fetched = await aget_many([urls[i] for i in missing], return_exceptions=True)
+    for i, value in zip(missing, fetched):
+        results[i] = value
+    return results
+
+
+async def aiter_resolve_urls(urls: list[str]) -> AsyncIterator[tuple[int, Any]]:
+    """Like :func:`aresolve_urls`, but yield ``(index, record or exception)``
+    as each URL resolves, for streaming responses.
+
+    Records already in memory come first; at most ``fanout_concurrency``
+    fetches are in flight, so only that many results are ever pending.
+    Stopping the iteration early cancels the fetches still running.
+    """
+    remote: list[tuple[int, str]] = []
+    for i, url in enumerate(urls):
+        resource, resource_id, _ = split_swapi_url(url)
+        record = get_record(resource, resource_id) if resource_id is not None else None
+        if record is None:
+            remote.append((i, url))
+        else:
+            yield i, record
+    queued = iter(remote)
+    running: dict[asyncio.Task, int] = {}
+
+    def start_next() -> None:
+        item = next(queued, None)
+        if item is not None:
+            running[asyncio.ensure_future(aget_by_url(item[1]))] = item[0]
+
+    try:
+        for _ in range(max(1, get_settings().fanout_concurrency)):
+            start_next()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = running.pop(task)
+                start_next()
+                error = task.exception()
+                yield index, error if error is not None else task.result()
+    finally:
+        for task in running:
+            task.cancel()
@@ -0,0 +1,135 @@
+"""Optional on-disk second cache tier (SQLite) for raw SWAPI responses.
+
+Sits behind the in-memory cache so a new process on the same host or volume
+starts warm. Reads go straight to SQLite (read-through); writes are queued
+and committed in batches by a background thread (write-behind) so a request
+never waits on disk I/O.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    validators TEXT
+)
+"""
+
+
+class DiskCache:
+    """Raw response bytes keyed by URL, with wall-clock expiry."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._reader = self._connect()
+        self._reader.execute(_SCHEMA)
+        columns = {row[1] for row in self._reader.execute("PRAGMA table_info(responses)")}
+        if "validators" not in columns:
+            # Files written before validators were stored.
+            self._reader.execute("ALTER TABLE responses ADD COLUMN validators TEXT")
+        self._reader.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        self._reader.commit()
+        self._read_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        # WAL lets several processes on the host read while one writes.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, key: str) -> tuple[bytes, float, dict[str, str] | None] | None:
+        """Return ``(body, remaining_ttl_seconds, validators)`` for an unexpired entry.
+
+        Blocking (SQLite, up to a 5 s lock wait): async callers run it in a thread.
+        """
+        try:
+            with self._read_lock:
+                row = self._reader.execute(
+                    "SELECT body, expires_at, validators FROM responses WHERE url = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        remaining = row[1] - time.time() if row is not None else 0
+        if remaining <= 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        validators = json.loads(row[2]) if row[2] else None
+        return bytes(row[0]), remaining, validators
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        ttl_seconds: float,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        """Queue a write (with the origin's ``ETag``/``Last-Modified``, if any);
+        it is committed by the background writer."""
+        encoded = json.dumps(validators) if validators else None
+        self._queue.put((key, body, time.time() + ttl_seconds, encoded))
+        self._ensure_writer()
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "pending_writes": self._queue.qsize(),
+        }
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    name="swapi-disk-cache",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO responses (url, body, expires_at, validators) VALUES (?, ?, ?, ?)",
+                        batch,
+                    )
+                self.writes += len(batch)
+            except sqlite3.Error:
+                self.errors += 1
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
@@ -1,7 +1,11 @@
-"""Response formatting: sort, filter, expand related URLs."""
+"""Response formatting: sort, filter, expand related URLs, project fields."""
 
 from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from api.config import get_settings
+from api.services import catalog, relations, timing
+from api.services.snapshot import split_swapi_url
 from api.services.swapi_client import get_by_url
 
 
@@ -29,16 +33,122 @@ def sort_results(
     if not sort_by or not items:
         return items
     reverse = (order or "asc").lower() == "desc"
+    with timing.phase("sort"):
+        items.sort(key=lambda item: sort_key(item.get(sort_by)), reverse=reverse)
+    return items
 
-    def key(item: dict[str, Any]) -> Any:
-        val = item.get(sort_by)
-        num = _safe_number(val)
-        if num is not None:
-            return (0, num)
-        return (1, str(val).lower() if val else "")
 
-    items.sort(key=key, reverse=reverse)
-    return items
+def sort_key(value: Any) -> tuple[int, Any]:
+    """Normalized sort key: numbers first (numerically), then text (case-insensitive)."""
+    num = _safe_number(value)
+    if num is not None:
+        return (0, num)
+    return (1, str(value).lower() if value else "")
+
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+def _with_page(url: str, page: int) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "page"]
+    query.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def paginate(
+    items: list[dict[str, Any]],
+    page: int | None,
+    page_size: int | None,
+    url: str,
+) -> dict[str, Any] | None:
+    """SWAPI-shaped page over a full result list; None if ``page`` is out of range.
+
+    ``next``/``previous`` point back at ``url`` (this API) with ``page`` replaced;
+    a relative ``url`` gives relative links.
+    """
+    page = page or 1
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    start = (page - 1) * page_size
+    if page < 1 or (start >= len(items) and page != 1):
+        return None
+    return {
+        "count": len(items),
+        "results": items[start:start + page_size],
+        "next": _with_page(url, page + 1) if start + page_size < len(items) else None,
+        "previous": _with_page(url, page - 1) if page > 1 else None,
+    }
+
+
+def parse_fields(fields: str | None) -> dict[str, Any] | None:
+    """Parse ``fields=name,homeworld.name`` into a projection tree.
+
+    Each key maps to the tree applied to its value, or None to keep the value
+    whole (``homeworld`` wins over ``homeworld.name``). Returns None when no
+    projection was asked for.
+    """
+    if not fields:
+        return None
+    tree: dict[str, Any] = {}
+    for path in fields.split(","):
+        parts = [p.strip() for p in path.split(".") if p.strip()]
+        node = tree
+        for depth, part in enumerate(parts):
+            if depth == len(parts) - 1:
+                node[part] = None
+            elif part not in node:
+                node[part] = node = {}
+            elif node[part] is None:
+                break
+            else:
+                node = node[part]
+    return tree or None
+
+
+def project(value: Any, tree: dict[str, Any] | None) -> Any:
+    """Copy of ``value`` with only the fields in ``tree`` (see :func:`parse_fields`).
+
+    Lists are projected item by item; URLs and other scalars are kept as-is.
+    Never mutates ``value`` (it may be a shared cached record).
+    """
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+
+def project_page(page: dict[str, Any], tree: dict[str, Any] | None) -> dict[str, Any]:
+    """Project each of a list response's ``results``, keeping the envelope."""
+    if tree is None:
+        return page
+    return {**page, "results": project(page.get("results") or [], tree)}
+
+
+def restrict_expand(expand_keys: set[str], tree: dict[str, Any] | None) -> set[str]:
+    """Cut expand paths to what the projection keeps: the rest are never fetched.
+
+    ``characters.homeworld`` with ``fields=characters.name`` becomes
+    ``characters``; with ``fields=title`` it is dropped.
+    """
+    if tree is None:
+        return expand_keys
+    kept: set[str] = set()
+    for path in expand_keys:
+        node: dict[str, Any] | None = tree
+        parts: list[str] = []
+        for part in path.split("."):
+            part = part.strip()
+            if node is not None and part not in node:
+                break
+            parts.append(part)
+            node = node[part] if node is not None else None
+        if parts:
+            kept.add(".".join(parts))
+    return kept
 
 
 def filter_people_by_gender(
@@ -57,36 +167,112 @@ def filter_by_film_id(
     film_id: int,
     film_url_path: str = "films",
 ) -> list[dict[str, Any]]:
-    """Filter items that appear in the given film (by id)."""
+    """Filter items that appear in the given film (by id).
+
+    Uses the relation index when the film is indexed, else the items' own
+    film URL lists.
+    """
     if not items:
         return items
-    target_suffix = f"/films/{film_id}/"
-    return [
-        item
-        for item in items
-        if any(
-            target_suffix in (u or "")
+    related: dict[str, set[int] | None] = {}
+
+    def appears(item: dict[str, Any]) -> bool:
+        resource, item_id, _ = split_swapi_url(item.get("url") or "")
+        if item_id is not None:
+            if resource not in related:
+                ids = relations.index.related("films", film_id, resource)
+                related[resource] = set(ids) if ids is not None else None
+            if related[resource] is not None:
+                return item_id in related[resource]
+        return any(
+            split_swapi_url(u or "")[:2] == ("films", film_id)
             for u in (item.get(film_url_path) or item.get("films") or [])
         )
-    ]
+
+    return [item for item in items if appears(item)]
+
+
+def parse_expand(expand_keys: set[str]) -> dict[str, Any]:
+    """Expand paths (``characters.homeworld``) as a tree, cut at ``EXPAND_MAX_DEPTH``.
+
+    Every node is expanded; its subtree is expanded inside each fetched record.
+    """
+    max_depth = get_settings().expand_max_depth
+    tree: dict[str, Any] = {}
+    for path in expand_keys:
+        node = tree
+        for part in [p.strip() for p in path.split(".") if p.strip()][:max_depth]:
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _pending_urls(level: list[tuple[dict[str, Any], dict[str, Any]]], memo: dict[str, Any]) -> list[str]:
+    """Distinct URLs this level needs that the request hasn't resolved yet."""
+    pending: dict[str, None] = {}
+    for obj, tree in level:
+        for key in tree:
+            val = obj.get(key)
+            for url in val if isinstance(val, list) else [val]:
+                if isinstance(url, str) and url not in memo:
+                    pending[url] = None
+    return list(pending)
+
+
+def _within_budget(urls: list[str], memo: dict[str, Any]) -> list[str]:
+    limit = get_settings().expand_max_urls
+    if limit <= 0:
+        return urls
+    return urls[:max(0, limit - len(memo))]
+
+
+def _apply_level(
+    level: list[tuple[dict[str, Any], dict[str, Any]]],
+    memo: dict[str, Any],
+) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    """Swap this level's URLs for their records; returns the next level.
+
+    Records that will be expanded further are copied (cached records are
+    shared); URLs that failed or fell outside the budget stay as URLs.
+    """
+    next_level: list[tuple[dict[str, Any], dict[str, Any]]] = []
+
+    def resolved(url: str, subtree: dict[str, Any]) -> Any:
+        record = memo.get(url)
+        if not isinstance(record, dict):
+            return url
+        if subtree:
+            record = dict(record)
+            next_level.append((record, subtree))
+        return record
+
+    for obj, tree in level:
+        for key, subtree in tree.items():
+            val = obj.get(key)
+            if isinstance(val, list):
+                obj[key] = [resolved(u, subtree) for u in val if isinstance(u, str)]
+            elif isinstance(val, str):
+                obj[key] = resolved(val, subtree)
+    return next_level
 
 
 def expand_urls(
     data: dict[str, Any],
     expand_keys: set[str],
 ) -> dict[str, Any]:
-    """Replace URL fields with full objects (fetch from SWAPI)."""
+    """Replace URL fields with full objects (fetch from SWAPI).
+
+    Keys may be dotted paths (``characters.homeworld``); see :func:`aexpand_urls`.
+    """
     if not expand_keys:
         return data
     result = dict(data)
-    for key in expand_keys:
-        if key not in result:
-            continue
-        val = result[key]
-        if isinstance(val, list):
-            result[key] = [_fetch_one(u) for u in val if isinstance(u, str)]
-        elif isinstance(val, str):
-            result[key] = _fetch_one(val)
+    memo: dict[str, Any] = {}
+    level = [(result, parse_expand(expand_keys))]
+    with timing.phase("expand"):
+        while level:
+            for url in _within_budget(_pending_urls(level, memo), memo):
+                memo[url] = _fetch_one(url)
+            level = _apply_level(level, memo)
     return result
 
 
@@ -96,3 +282,29 @@ def _fetch_one(url: str) -> dict[str, Any] | str:
         return get_by_url(url)
     except Exception:
         return url
+
+
+async def aexpand_urls(
+    data: dict[str, Any],
+    expand_keys: set[str],
+) -> dict[str, Any]:
+    """Async variant of :func:`expand_urls`, resolved level by level.
+
+    ``expand_keys`` may hold dotted paths (``characters.homeworld``), up to
+    ``EXPAND_MAX_DEPTH`` levels. Each level's URLs are resolved together:
+    records already in loaded collections are used as-is, the rest are fetched
+    concurrently. A per-call memo resolves every distinct URL at most once,
+    and at most ``EXPAND_MAX_URLS`` of them; URLs that fail or exceed the
+    budget are left as URLs.
+    """
+    if not expand_keys:
+        return data
+    result = dict(data)
+    memo: dict[str, Any] = {}
+    level = [(result, parse_expand(expand_keys))]
+    with timing.phase("expand"):
+        while level:
+            urls = _within_budget(_pending_urls(level, memo), memo)
+            memo.update(zip(urls, await catalog.aresolve_urls(urls)))
+            level = _apply_level(level, memo)
+    return result
@@ -0,0 +1,281 @@
+"""In-process metrics registry, rendered in the Prometheus text format.
+
+Counters and histograms keep one small record per label combination, updated
+under a single lock (the sync client's refresh threads write too), so an
+update costs a dict lookup and a couple of additions. Values derived from
+state kept elsewhere (cache size, client counters) are read at scrape time
+through callbacks instead of being mirrored on every change.
+
+SWAPI traffic is attributed to endpoints through the request's
+``api.services.timing.RequestTimings``, which counts the upstream calls made
+while serving it (including from tasks it spawns).
+"""
+
+import bisect
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from api.config import get_settings
+
+# Seconds; covers cache hits (sub-ms) through slow upstream pages.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+
+Sample = tuple[str, dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def clear(self) -> None:
+        pass
+
+    def samples(self) -> Iterator[Sample]:
+        return iter(())
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with _lock:
+            return self._values.get(labels, 0)
+
+    def clear(self) -> None:
+        with _lock:
+            self._values.clear()
+
+    def samples(self) -> Iterator[Sample]:
+        with _lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram(_Metric):
+    """Bucketed observations (e.g. latencies) per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._values: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        with _lock:
+            series = self._values.get(labels)
+            return series[2] if series is not None else 0
+
+    def clear(self) -> None:
+        with _lock:
+            self._values.clear()
+
+    def samples(self) -> Iterator[Sample]:
+        with _lock:
+            values = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._values.items()]
+        for labels, counts, total, count in values:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, count
+
+
+class Callback(_Metric):
+    """Gauge or counter whose values are read from ``collect`` at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+        kind: str = "gauge",
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def samples(self) -> Iterator[Sample]:
+        for labels, value in self._collect():
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Registry:
+    """Named metrics, rendered together by :meth:`render`."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+        kind: str = "gauge",
+    ) -> Callback:
+        return self._add(Callback(name, documentation, labelnames, collect, kind))
+
+    def clear(self) -> None:
+        """Reset every counter and histogram (e.g. for tests)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "swapi_upstream_requests_total",
+    "HTTP requests sent to SWAPI, by resource and response status (error: no response).",
+    ("resource", "status"),
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "swapi_upstream_request_duration_seconds",
+    "Latency of each HTTP request sent to SWAPI.",
+    ("resource",),
+)
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "swapi_upstream_retries_total",
+    "SWAPI requests retried after a timeout or 502/503/504.",
+    ("resource",),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "swapi_cache_lookups_total",
+    "SWAPI client lookups by resource and result (hit, negative_hit, stale, coalesced, miss).",
+    ("resource", "result"),
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "Requests served, by route template, method and status.",
+    ("endpoint", "method", "status"),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    ("endpoint",),
+)
+HTTP_UPSTREAM_CALLS = REGISTRY.counter(
+    "http_upstream_calls_total",
+    "SWAPI requests made while serving each route template.",
+    ("endpoint",),
+)
+
+
+def enabled() -> bool:
+    return get_settings().metrics_enabled
+
+
+def observe_request(
+    endpoint: str,
+    method: str,
+    status: int,
+    seconds: float,
+    upstream_calls: int = 0,
+) -> None:
+    HTTP_REQUESTS.inc(endpoint, method, str(status))
+    HTTP_LATENCY.observe(seconds, endpoint)
+    if upstream_calls:
+        HTTP_UPSTREAM_CALLS.inc(endpoint, amount=upstream_calls)
+
+
+def record_upstream(resource: str, status: str, seconds: float) -> None:
+    """One HTTP request to SWAPI."""
+    if enabled():
+        UPSTREAM_REQUESTS.inc(resource, status)
+        UPSTREAM_LATENCY.observe(seconds, resource)
+
+
+def record_retries(resource: str, count: int = 1) -> None:
+    if count and enabled():
+        UPSTREAM_RETRIES.inc(resource, amount=count)
+
+
+def record_lookup(resource: str, result: str) -> None:
+    if enabled():
+        CACHE_LOOKUPS.inc(resource, result)
@@ -0,0 +1,161 @@
+"""Opt-in sampling profiler for selected requests.
+
+While a selected request runs, a thread samples the event loop thread's stack
+every ``PROFILE_INTERVAL_MS`` and folds the stacks into a call tree, written
+as text to ``PROFILE_DIR``. Nothing is traced between samples, so the request
+runs at full speed. The loop is shared: samples include whatever else the
+instance was doing, and time spent waiting on SWAPI shows up as the loop idle
+in ``select``.
+
+A request is selected when it carries ``X-Profile-Token`` equal to
+``PROFILE_TOKEN``, or at random with probability ``PROFILE_SAMPLE_RATE``.
+At most ``PROFILE_MAX_FILES`` profiles are kept per process (the default
+directory is memory-backed on Cloud Functions): random sampling stops once
+the budget is used, and a token-requested profile replaces the oldest one.
+"""
+
+import hmac
+import itertools
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from api.config import Settings
+
+PROFILE_TOKEN_HEADER = "x-profile-token"
+
+# (filename, first line, qualified name) -> [samples, children]
+_Node = dict[tuple[str, int, str], list[Any]]
+
+_sequence = itertools.count(1)
+
+# Profiles written by this process, oldest first.
+_written: deque[str] = deque()
+_written_lock = threading.Lock()
+
+
+def selected(headers: Any, settings: Settings) -> bool:
+    """Whether to profile a request with these headers."""
+    if settings.profile_token:
+        given = headers.get(PROFILE_TOKEN_HEADER)
+        if given and hmac.compare_digest(given.encode(), settings.profile_token.encode()):
+            return True
+    rate = settings.profile_sample_rate
+    return rate > 0 and random.random() < rate and len(_written) < settings.profile_max_files
+
+
+def _short_path(filename: str) -> str:
+    cwd = os.getcwd()
+    if filename.startswith(cwd + os.sep):
+        return os.path.relpath(filename, cwd)
+    return os.path.join(*filename.split(os.sep)[-2:]) if os.sep in filename else filename
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval into a call tree."""
+
+    def __init__(self, thread_id: int, interval_seconds: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval_seconds
+        self.samples = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._root: _Node = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._add(frame)
+
+    def _add(self, frame: Any) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self.samples += 1
+        node = self._root
+        for code in reversed(stack):
+            key = (code.co_filename, code.co_firstlineno, getattr(code, "co_qualname", code.co_name))
+            child = node.get(key)
+            if child is None:
+                child = node[key] = [0, {}]
+            child[0] += 1
+            node = child[1]
+
+    def render(self) -> str:
+        """Call tree, heaviest branches first: share of samples, samples, frame."""
+        lines = [
+            f"{self.samples} samples every {self.interval * 1000:g} ms over {self.elapsed * 1000:.1f} ms"
+        ]
+        total = self.samples or 1
+
+        def by_weight(children: _Node) -> list[tuple[tuple[str, int, str], list[Any]]]:
+            return sorted(children.items(), key=lambda kv: kv[1][0])
+
+        # Iterative walk: deep async stacks must not hit the recursion limit here.
+        pending = [(0, key, node) for key, node in by_weight(self._root)]
+        while pending:
+            depth, (filename, line, name), (count, children) = pending.pop()
+            lines.append(
+                f"{count / total * 100:5.1f}% {count:6d}  {'  ' * depth}{name} ({_short_path(filename)}:{line})"
+            )
+            pending.extend((depth + 1, key, node) for key, node in by_weight(children))
+        return "\n".join(lines) + "\n"
+
+
+def profile_path(settings: Settings) -> str:
+    """A new file path under ``PROFILE_DIR`` (named before the request runs,
+    so it can be returned in a response header)."""
+    directory = settings.profile_dir or tempfile.gettempdir()
+    name = f"profile-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(_sequence)}.txt"
+    return os.path.join(directory, name)
+
+
+def dump(profiler: SamplingProfiler, label: str, path: str, max_files: int) -> None:
+    """Write the call tree for the request ``label`` to ``path``.
+
+    Blocking (file I/O): run it off the event loop. Removes this process's
+    oldest profiles beyond ``max_files``.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{label}\n{profiler.render()}")
+    with _written_lock:
+        _written.append(path)
+        expired = [_written.popleft() for _ in range(len(_written) - max(1, max_files))]
+    for old in expired:
+        try:
+            os.remove(old)
+        except FileNotFoundError:
+            pass
+
+
+def finish(profiler: SamplingProfiler, label: str, path: str, max_files: int) -> None:
+    """Stop sampling and write the profile (blocking: joins the sampler thread)."""
+    profiler.stop()
+    dump(profiler, label, path, max_files)
+
+
+def clear_written() -> None:
+    """Forget which profiles this process wrote (e.g. for tests)."""
+    with _written_lock:
+        _written.clear()
@@ -0,0 +1,81 @@
+"""Cross-resource relationship index (film <-> character, planet <-> resident, ...).
+
+Every SWAPI record lists its related resources as URLs. Indexing a record
+stores those links as ``(resource, id)`` edges in both directions, so a
+correlated query ("films of person 1", "people of film 2") is a dict lookup
+instead of fetching and scanning records.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any
+
+from api.services.snapshot import split_swapi_url
+
+Node = tuple[str, int]
+
+
+def record_links(record: dict[str, Any]) -> set[Node]:
+    """Every ``(resource, id)`` a record points to through URL fields."""
+    links: set[Node] = set()
+    for field, value in record.items():
+        if field == "url":
+            continue
+        for url in value if isinstance(value, list) else [value]:
+            if isinstance(url, str) and url.startswith(("http://", "https://")):
+                resource, resource_id, _ = split_swapi_url(url)
+                if resource_id is not None:
+                    links.add((resource, resource_id))
+    return links
+
+
+class RelationIndex:
+    """Bidirectional id index; re-indexing a record replaces its old edges."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._forward: dict[Node, set[Node]] = {}
+        self._reverse: dict[Node, set[Node]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._forward.clear()
+            self._reverse.clear()
+
+    def index_record(self, record: dict[str, Any]) -> None:
+        resource, resource_id, _ = split_swapi_url(record.get("url") or "")
+        if resource_id is None:
+            return
+        node = (resource, resource_id)
+        links = record_links(record)
+        with self._lock:
+            for old in self._forward.get(node, ()):
+                self._reverse[old].discard(node)
+            self._forward[node] = links
+            for target in links:
+                self._reverse[target].add(node)
+
+    def index_records(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            self.index_record(record)
+
+    def related(self, resource: str, resource_id: int, target: str) -> list[int] | None:
+        """Ids of ``target`` linked to the node, or None if the node isn't indexed.
+
+        A record lists all of its own links, so once the node itself has been
+        indexed the answer is complete; reverse edges add links that only the
+        other side declares.
+        """
+        node = (resource, resource_id)
+        with self._lock:
+            forward = self._forward.get(node)
+            if forward is None:
+                return None
+            linked = forward | self._reverse.get(node, set())
+        return sorted(i for r, i in linked if r == target)
+
+
+index = RelationIndex()
@@ -0,0 +1,126 @@
+"""Local search index over collection name/title fields.
+
+Answers ``?search=`` with SWAPI's semantics (case-insensitive substring of
+``name``/``title``/``model``, see ``snapshot.SEARCH_FIELDS``) without a
+round-trip per distinct query. Each token of a field is indexed under all of
+its substrings (so prefixes and infixes both hit); a query's tokens select
+candidates by posting intersection, and a final substring check against the
+full field keeps the results identical to SWAPI's.
+"""
+
+import re
+import threading
+from typing import Any
+
+from api.services.snapshot import SEARCH_FIELDS, filter_search, split_swapi_url
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN.findall(text.lower()))
+
+
+def _substrings(token: str) -> set[str]:
+    return {token[i:j] for i in range(len(token)) for j in range(i + 1, len(token) + 1)}
+
+
+class SearchIndex:
+    """Substring postings for one resource; rebuilt incrementally per record."""
+
+    def __init__(self, resource: str) -> None:
+        self.resource = resource
+        self.fields = SEARCH_FIELDS.get(resource, ("name",))
+        self._postings: dict[str, set[int]] = {}
+        self._values: dict[int, tuple[str, ...]] = {}
+        self._records: dict[int, dict[str, Any]] = {}
+        self._order: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def update(self, records: list[dict[str, Any]]) -> int:
+        """Sync the index with a collection; returns how many docs were (re)indexed.
+
+        Records whose search fields are unchanged keep their postings.
+        """
+        seen: set[int] = set()
+        reindexed = 0
+        for position, record in enumerate(records):
+            _, doc_id, _ = split_swapi_url(record.get("url") or "")
+            if doc_id is None:
+                continue
+            seen.add(doc_id)
+            values = tuple(str(record.get(f) or "").lower() for f in self.fields)
+            self._records[doc_id] = record
+            self._order[doc_id] = position
+            if self._values.get(doc_id) == values:
+                continue
+            self._remove_postings(doc_id)
+            self._values[doc_id] = values
+            for token in set().union(*(_tokens(v) for v in values)):
+                for sub in _substrings(token):
+                    self._postings.setdefault(sub, set()).add(doc_id)
+            reindexed += 1
+        for doc_id in set(self._records) - seen:
+            self._remove_postings(doc_id)
+            del self._records[doc_id], self._order[doc_id], self._values[doc_id]
+        return reindexed
+
+    def search(self, query: str) -> list[dict[str, Any]]:
+        """Records matching ``query``, in collection order."""
+        needle = query.lower()
+        tokens = _tokens(needle)
+        if tokens:
+            candidates = set.intersection(*(self._postings.get(t, set()) for t in tokens))
+        else:
+            candidates = set(self._records)
+        matched = [
+            doc_id
+            for doc_id in candidates
+            if any(needle in value for value in self._values[doc_id])
+        ]
+        matched.sort(key=self._order.__getitem__)
+        return [self._records[doc_id] for doc_id in matched]
+
+    def _remove_postings(self, doc_id: int) -> None:
+        for value in self._values.get(doc_id, ()):
+            for token in _tokens(value):
+                for sub in _substrings(token):
+                    postings = self._postings.get(sub)
+                    if postings is not None:
+                        postings.discard(doc_id)
+                        if not postings:
+                            del self._postings[sub]
+
+
+_indexes: dict[str, SearchIndex] = {}
+_lock = threading.Lock()
+
+
+def clear() -> None:
+    with _lock:
+        _indexes.clear()
+
+
+def index_collection(resource: str, records: list[dict[str, Any]]) -> None:
+    """(Re)build the index for a freshly loaded collection."""
+    with _lock:
+        index = _indexes.get(resource)
+        if index is None:
+            index = _indexes[resource] = SearchIndex(resource)
+        index.update(records)
+
+
+def search(
+    resource: str,
+    records: list[dict[str, Any]],
+    query: str | None,
+) -> list[dict[str, Any]]:
+    """Filter ``records`` by ``query``; uses the index when one is built."""
+    if not query:
+        return records
+    index = _indexes.get(resource)
+    if index is None:
+        return filter_search(resource, records, query)
+    return index.search(query)
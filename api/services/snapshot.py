@@ -0,0 +1,178 @@
+"""Offline SWAPI dataset: build a snapshot file and answer requests from it.
+
+SWAPI data almost never changes, so a deployment can ship a snapshot of every
+collection and run with ``SWAPI_MODE=snapshot``: ``swapi_client`` then answers
+``get_resource`` / ``get_list`` / ``get_by_url`` from memory with no network I/O.
+
+Build a snapshot (with ``SWAPI_MODE`` unset, i.e. against the live API)::
+
+    python -m api.services.snapshot data/swapi-snapshot.json.gz
+"""
+
+import gzip
+import json
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+RESOURCES = ("films", "people", "planets", "species", "starships", "vehicles")
+
+# Fields matched by SWAPI's ``?search=`` (case-insensitive substring).
+SEARCH_FIELDS: dict[str, tuple[str, ...]] = {
+    "films": ("title",),
+    "people": ("name",),
+    "planets": ("name",),
+    "species": ("name",),
+    "starships": ("name", "model"),
+    "vehicles": ("name", "model"),
+}
+
+PAGE_SIZE = 10
+
+
+def split_swapi_url(url: str) -> tuple[str, int | None, dict[str, str]]:
+    """Split a SWAPI URL into ``(resource, id, query)``.
+
+    ``https://swapi.dev/api/people/1/`` -> ``("people", 1, {})``;
+    ``https://swapi.dev/api/people/?page=2`` -> ``("people", None, {"page": "2"})``.
+    Returns ``("", None, {})`` for URLs that don't look like a resource.
+    """
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s]
+    if "api" in segments:
+        segments = segments[segments.index("api") + 1:]
+    query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+    if len(segments) == 1:
+        return segments[0], None, query
+    if len(segments) == 2 and segments[1].isdigit():
+        return segments[0], int(segments[1]), query
+    return "", None, {}
+
+
+def filter_search(
+    resource: str,
+    records: list[dict[str, Any]],
+    search: str | None,
+) -> list[dict[str, Any]]:
+    """Records matching SWAPI's ``?search=`` (case-insensitive substring)."""
+    if not search:
+        return records
+    needle = search.lower()
+    fields = SEARCH_FIELDS.get(resource, ("name",))
+    return [r for r in records if any(needle in str(r.get(f) or "").lower() for f in fields)]
+
+
+class Snapshot:
+    """In-memory view of a snapshot file, indexed by resource and id."""
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.created_at: float = data.get("created_at", 0)
+        self._records: dict[str, dict[int, dict[str, Any]]] = {}
+        for resource, records in (data.get("resources") or {}).items():
+            by_id = {}
+            for record in records:
+                _, resource_id, _ = split_swapi_url(record.get("url") or "")
+                if resource_id is not None:
+                    by_id[resource_id] = record
+            self._records[resource] = dict(sorted(by_id.items()))
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        with gzip.open(path, "rb") as f:
+            return cls(json.loads(f.read()))
+
+    def resources(self) -> list[str]:
+        return list(self._records)
+
+    def records(self, resource: str) -> list[dict[str, Any]]:
+        """Every record of a collection, in id order."""
+        return list(self._records.get(resource, {}).values())
+
+    def get(self, resource: str, resource_id: int) -> dict[str, Any] | None:
+        return self._records.get(resource, {}).get(resource_id)
+
+    def page(
+        self,
+        resource: str,
+        base_url: str,
+        page: int | None = None,
+        search: str | None = None,
+    ) -> dict[str, Any] | None:
+        """One SWAPI-shaped list page, or None if the resource/page doesn't exist."""
+        if resource not in self._records:
+            return None
+        records = filter_search(resource, self.records(resource), search)
+        page = page or 1
+        start = (page - 1) * PAGE_SIZE
+        if page < 1 or (start >= len(records) and page != 1):
+            return None
+
+        def page_url(n: int) -> str:
+            query = f"search={search}&page={n}" if search else f"page={n}"
+            return f"{base_url}/{resource}/?{query}"
+
+        return {
+            "count": len(records),
+            "next": page_url(page + 1) if start + PAGE_SIZE < len(records) else None,
+            "previous": page_url(page - 1) if page > 1 else None,
+            "results": records[start:start + PAGE_SIZE],
+        }
+
+    def resolve(self, url: str, base_url: str) -> dict[str, Any] | None:
+        """Answer any SWAPI resource or list URL; None means 404."""
+        resource, resource_id, query = split_swapi_url(url)
+        if resource_id is not None:
+            return self.get(resource, resource_id)
+        if not resource:
+            return None
+        try:
+            page = int(query["page"]) if "page" in query else None
+        except ValueError:
+            return None
+        return self.page(resource, base_url, page=page, search=query.get("search"))
+
+
+def build_snapshot(path: str) -> dict[str, int]:
+    """Crawl every SWAPI collection and write a gzip'd snapshot to ``path``.
+
+    Returns the number of records stored per resource.
+    """
+    from api.services.swapi_client import get_list
+
+    resources: dict[str, list[dict[str, Any]]] = {}
+    for resource in RESOURCES:
+        records: list[dict[str, Any]] = []
+        page = 1
+        while True:
+            raw = get_list(resource, page=page)
+            records.extend(raw.get("results") or [])
+            if not raw.get("next"):
+                break
+            page += 1
+        resources[resource] = records
+    payload = {"created_at": time.time(), "resources": resources}
+    with gzip.open(path, "wb") as f:
+        f.write(json.dumps(payload, separators=(",", ":")).encode())
+    return {resource: len(records) for resource, records in resources.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from api.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Build an offline SWAPI snapshot.")
+    parser.add_argument(
+        "output",
+        nargs="?",
+        default=get_settings().swapi_snapshot_path,
+        help="snapshot file to write (default: SWAPI_SNAPSHOT_PATH)",
+    )
+    args = parser.parse_args()
+    if get_settings().swapi_mode == "snapshot":
+        parser.error("unset SWAPI_MODE=snapshot to crawl the live API")
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    for resource, count in build_snapshot(args.output).items():
+        print(f"{resource}: {count}")
+    print(f"wrote {args.output}")
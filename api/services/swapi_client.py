@@ -1,13 +1,39 @@
-"""HTTP client for SWAPI with retry, timeout, and in-memory cache."""
+"""HTTP client for SWAPI with retry, timeout, and bounded in-memory cache.
 
-import time
-from typing import Any
+Two transports share the same cache and error types:
+
+- ``get_resource`` / ``get_list`` / ``get_by_url``: blocking, built on ``requests``.
+- ``aget_resource`` / ``aget_list`` / ``aget_by_url``: asyncio-native, built on
+  ``httpx``; used by the routers so a request never holds a worker thread
+  while it waits on SWAPI.
+
+With ``SWAPI_MODE=snapshot`` both answer from a local snapshot file instead
+(see ``api.services.snapshot``).
+
+The transport libraries (and the disk tier's sqlite3) are imported on first
+use, not at module import, so a cold instance only pays for what it serves.
+"""
+
+from __future__ import annotations
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from api.config import get_settings
+from api.services import metrics, timing
+from api.services.cache import CacheEntry, TTLCache
+from api.services.snapshot import RESOURCES, Snapshot, split_swapi_url
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+    from api.services.disk_cache import DiskCache
 
 
 class SWAPIClientError(Exception):
@@ -22,13 +48,33 @@ class SWAPINotFoundError(SWAPIClientError):
     pass
 
 
+_RETRY_STATUSES = (502, 503, 504)
+_BACKOFF_FACTOR = 0.5
+
+
+@lru_cache(maxsize=4096)
+def _resource_label(url: str) -> str:
+    """Metric label for ``url``: its SWAPI resource, or ``other`` (bounded cardinality)."""
+    resource = split_swapi_url(url)[0]
+    return resource if resource in RESOURCES else "other"
+
+
+def _record_upstream(resource: str, status: str, seconds: float) -> None:
+    metrics.record_upstream(resource, status, seconds)
+    timing.record_upstream(seconds)
+
+
 def _make_session() -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
     settings = get_settings()
     session = requests.Session()
     retry = Retry(
         total=settings.request_retries,
-        backoff_factor=0.5,
-        status_forcelist=(502, 503, 504),
+        backoff_factor=_BACKOFF_FACTOR,
+        status_forcelist=_RETRY_STATUSES,
     )
     adapter = HTTPAdapter(max_retries=retry)
     session.mount("https://", adapter)
@@ -46,73 +92,579 @@ def _get_session() -> requests.Session:
     return _session
 
 
-class _CacheEntry:
-    def __init__(self, data: Any, ttl_seconds: int) -> None:
-        self.data = data
-        self.expires_at = time.monotonic() + ttl_seconds
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _make_async_client() -> httpx.AsyncClient:
+    import httpx
+
+    settings = get_settings()
+    return httpx.AsyncClient(
+        timeout=settings.request_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_connections,
+        ),
+    )
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, rebuilding it if the event loop changed.
+
+    An httpx connection pool is bound to the loop that created it; test clients
+    and some servers run each request on a fresh loop.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = _make_async_client()
+        _async_client_loop = loop
+    return _async_client
+
 
-    def is_valid(self) -> bool:
-        return time.monotonic() < self.expires_at
+async def awarmup() -> None:
+    """Pay one-time setup ahead of the first request (e.g. at instance start).
 
+    Imports the transport and builds the connection pool on the running loop
+    (live mode) or loads the snapshot (snapshot mode), and opens the disk tier
+    in a thread (connecting, WAL setup and the expiry sweep block).
+    """
+    if get_settings().swapi_mode == "snapshot":
+        get_snapshot()
+    else:
+        _get_async_client()
+    if get_settings().cache_disk_path:
+        await asyncio.to_thread(_get_disk_cache)
+
+
+async def aclose() -> None:
+    """Close the shared AsyncClient (e.g. on app shutdown)."""
+    global _async_client, _async_client_loop
+    client, loop = _async_client, _async_client_loop
+    _async_client = None
+    _async_client_loop = None
+    if client is not None and loop is asyncio.get_running_loop():
+        await client.aclose()
 
-_cache: dict[str, _CacheEntry] = {}
+
+_cache: TTLCache | None = None
+
+
+def _get_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = TTLCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            sweep_interval_seconds=settings.cache_sweep_interval_seconds,
+        )
+    return _cache
 
 
 def clear_cache() -> None:
-    """Clear in-memory cache (e.g. for tests)."""
-    _cache.clear()
+    """Clear in-memory cache and client counters (e.g. for tests)."""
+    _get_cache().clear()
+    with _inflight_lock:
+        for name in _counters:
+            _counters[name] = 0
+
+
+def cache_stats() -> dict[str, Any]:
+    """Size, budget, hit ratio and eviction counters of the cache tiers."""
+    stats = _get_cache().stats()
+    disk = _get_disk_cache()
+    if disk is not None:
+        stats["disk"] = disk.stats()
+    return stats
+
 
+def _cache_entry(key: str) -> CacheEntry | None:
+    started = time.perf_counter()
+    entry = _get_cache().get_entry(key)
+    timing.record("cache", time.perf_counter() - started)
+    return entry
+
+
+def _stale_seconds() -> int:
+    settings = get_settings()
+    return max(
+        settings.cache_stale_while_revalidate_seconds,
+        settings.cache_stale_if_error_seconds,
+    )
 
-def _cache_get(key: str) -> Any | None:
-    entry = _cache.get(key)
-    if entry is None or not entry.is_valid():
-        if key in _cache:
-            del _cache[key]
+
+def _cache_set(
+    key: str,
+    value: Any,
+    ttl_seconds: int,
+    size: int | None = None,
+    validators: dict[str, str] | None = None,
+) -> None:
+    _get_cache().set(key, value, ttl_seconds, size, _stale_seconds(), validators)
+
+
+_disk_cache: DiskCache | None = None
+_disk_cache_path: str | None = None
+_disk_cache_lock = threading.Lock()
+
+
+def _get_disk_cache() -> DiskCache | None:
+    """Second cache tier, or None when ``CACHE_DISK_PATH`` is unset/unusable.
+
+    Opening it blocks (SQLite connect, WAL pragma, expiry sweep): async callers
+    reach it through a thread.
+    """
+    global _disk_cache, _disk_cache_path
+    path = get_settings().cache_disk_path
+    if path == _disk_cache_path:
+        return _disk_cache
+    with _disk_cache_lock:
+        if path != _disk_cache_path:
+            disk = None
+            if path:
+                import sqlite3
+
+                from api.services.disk_cache import DiskCache
+
+                try:
+                    disk = DiskCache(path)
+                except sqlite3.Error:
+                    disk = None
+            _disk_cache, _disk_cache_path = disk, path
+    return _disk_cache
+
+
+def flush_disk_cache() -> None:
+    """Wait for queued disk-cache writes (e.g. on shutdown or in tests)."""
+    disk = _get_disk_cache()
+    if disk is not None:
+        disk.flush()
+
+
+def _disk_read(url: str) -> Any | None:
+    """Read-through from the disk tier, promoting a hit into memory."""
+    disk = _get_disk_cache()
+    if disk is None:
+        return None
+    with timing.phase("cache"):
+        hit = disk.get(url)
+    if hit is None:
         return None
+    body, remaining, validators = hit
+    data = json.loads(body)
+    _cache_set(url, data, min(get_settings().cache_ttl_seconds, remaining), len(body), validators)
+    return data
+
+
+def _store(url: str, data: Any, body: bytes, validators: dict[str, str] | None = None) -> None:
+    """Cache a fresh upstream response in memory and (write-behind) on disk."""
+    settings = get_settings()
+    _cache_set(url, data, settings.cache_ttl_seconds, len(body), validators)
+    disk = _get_disk_cache()
+    if disk is not None:
+        disk.put(url, body, settings.cache_disk_ttl_seconds, validators)
+
+
+# Conditional revalidation: an expired entry keeps the origin's validators, and
+# the refresh asks SWAPI for the body only if it changed. A 304 restarts the
+# TTL of the same cached object, skipping download and JSON parsing.
+_VALIDATOR_HEADERS = {"etag": "If-None-Match", "last-modified": "If-Modified-Since"}
+
+
+def _validators(headers: Any) -> dict[str, str] | None:
+    """``ETag`` / ``Last-Modified`` from an upstream response, if any."""
+    found = {name: headers[name] for name in _VALIDATOR_HEADERS if name in headers}
+    return found or None
+
+
+def _conditional_headers(entry: CacheEntry | None) -> dict[str, str]:
+    if entry is None or not entry.validators:
+        return {}
+    return {_VALIDATOR_HEADERS[name]: value for name, value in entry.validators.items()}
+
+
+def _revalidated(url: str, entry: CacheEntry) -> Any:
+    """SWAPI answered 304: keep serving the cached object for another TTL."""
+    ttl = get_settings().cache_ttl_seconds
+    if not _get_cache().renew(url, ttl, _stale_seconds()):
+        _cache_set(url, entry.data, ttl, entry.size, entry.validators)
+    _count("revalidated")
     return entry.data
 
 
-def _cache_set(key: str, value: Any, ttl_seconds: int) -> None:
-    _cache[key] = _CacheEntry(value, ttl_seconds)
+_snapshot: Snapshot | None = None
 
 
-def _get(url: str) -> dict[str, Any]:
+def get_snapshot() -> Snapshot:
+    """The offline dataset used when ``SWAPI_MODE=snapshot`` (loaded once)."""
+    global _snapshot
+    if _snapshot is None:
+        path = get_settings().swapi_snapshot_path
+        try:
+            _snapshot = Snapshot.load(path)
+        except (OSError, ValueError) as e:
+            raise SWAPIClientError(f"SWAPI snapshot not available: {path}: {e}") from e
+    return _snapshot
+
+
+def _snapshot_get(url: str) -> dict[str, Any]:
+    data = get_snapshot().resolve(url, get_settings().swapi_base_url)
+    if data is None:
+        raise SWAPINotFoundError(f"Resource not found: {url}")
+    return data
+
+
+# Negative cache: a 404 is stored as this marker with its own, shorter TTL and
+# no stale window, so probes for dead ids/URLs don't reach SWAPI again.
+_NOT_FOUND = object()
+
+
+def _cache_not_found(url: str) -> SWAPINotFoundError:
+    ttl = get_settings().cache_not_found_ttl_seconds
+    if ttl > 0:
+        _get_cache().set(url, _NOT_FOUND, ttl, size=len(url))
+    return SWAPINotFoundError(f"Resource not found: {url}")
+
+
+def _cached_value(url: str, entry: CacheEntry) -> Any:
+    if entry.data is _NOT_FOUND:
+        _count("not_found_hits")
+        metrics.record_lookup(_resource_label(url), "negative_hit")
+        raise SWAPINotFoundError(f"Resource not found: {url}")
+    metrics.record_lookup(_resource_label(url), "hit")
+    return entry.data
+
+
+# Single-flight: concurrent misses for the same URL share one upstream fetch.
+# A concurrent.futures.Future can be waited on from threads (``result()``) and
+# from coroutines (``asyncio.wrap_future``), so sync and async callers coalesce
+# with each other too.
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+_counters: dict[str, int] = {
+    "coalesced_calls": 0,
+    "stale_served": 0,
+    "stale_if_error_served": 0,
+    "background_refreshes": 0,
+    "not_found_hits": 0,
+    "revalidated": 0,
+}
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _count(name: str) -> None:
+    with _inflight_lock:
+        _counters[name] += 1
+
+
+def _join_inflight(url: str) -> tuple[Future, bool]:
+    """Return ``(future, is_leader)``; only the leader performs the fetch."""
+    with _inflight_lock:
+        future = _inflight.get(url)
+        if future is not None:
+            _counters["coalesced_calls"] += 1
+            return future, False
+        future = Future()
+        _inflight[url] = future
+        return future, True
+
+
+def _try_lead(url: str) -> Future | None:
+    """Claim the fetch for ``url`` unless one is already in flight."""
+    with _inflight_lock:
+        if url in _inflight:
+            return None
+        future = Future()
+        _inflight[url] = future
+        return future
+
+
+def _finish_inflight(
+    url: str,
+    future: Future,
+    data: Any = None,
+    error: BaseException | None = None,
+) -> None:
+    with _inflight_lock:
+        _inflight.pop(url, None)
+    if future.cancelled():
+        return
+    if error is None:
+        future.set_result(data)
+    elif isinstance(error, Exception):
+        future.set_exception(error)
+    else:
+        # The fetch itself was cancelled or interrupted (e.g. shutdown); fail
+        # the waiting callers instead of cancelling them.
+        future.set_exception(SWAPIClientError(f"SWAPI request aborted: {url}"))
+
+
+def client_stats() -> dict[str, int]:
+    """Counters for the SWAPI client (e.g. for diagnostics)."""
+    with _inflight_lock:
+        return {**_counters, "inflight": len(_inflight)}
+
+
+def _cache_stat(name: str) -> Any:
+    return lambda: [((), _get_cache().stats()[name])]
+
+
+metrics.REGISTRY.callback(
+    "swapi_cache_entries", "Entries held by the in-memory SWAPI cache.", (), _cache_stat("entries")
+)
+metrics.REGISTRY.callback(
+    "swapi_cache_bytes", "Approximate bytes held by the in-memory SWAPI cache.", (), _cache_stat("bytes")
+)
+metrics.REGISTRY.callback(
+    "swapi_cache_evictions_total",
+    "Entries evicted to stay within the cache budgets.",
+    (),
+    _cache_stat("evictions"),
+    kind="counter",
+)
+metrics.REGISTRY.callback(
+    "swapi_client_events_total",
+    "SWAPI client events (coalesced calls, stale serves, refreshes, revalidations).",
+    ("event",),
+    lambda: [((name,), value) for name, value in client_stats().items() if name != "inflight"],
+    kind="counter",
+)
+metrics.REGISTRY.callback(
+    "swapi_inflight_fetches", "Upstream fetches currently in flight.", (), lambda: [((), client_stats()["inflight"])]
+)
+
+
+def _serve_while_revalidating(entry: CacheEntry | None) -> bool:
+    """True if ``entry`` is expired but inside the stale-while-revalidate window."""
+    return (
+        entry is not None
+        and not entry.is_valid()
+        and entry.staleness() <= get_settings().cache_stale_while_revalidate_seconds
+    )
+
+
+def _stale_or_raise(entry: CacheEntry | None, error: SWAPIClientError) -> Any:
+    """Stale-if-error: return the last good copy for 5xx/timeouts, else re-raise.
+
+    A 404 is an answer, not an outage, so it is never masked.
+    """
+    if (
+        entry is not None
+        and not isinstance(error, SWAPINotFoundError)
+        and entry.staleness() <= get_settings().cache_stale_if_error_seconds
+    ):
+        _count("stale_if_error_served")
+        return entry.data
+    raise error
+
+
+def _fetch(url: str, entry: CacheEntry | None = None) -> dict[str, Any]:
+    """Fetch ``url`` (disk tier, then SWAPI), revalidating ``entry`` if given."""
+    import requests
+
+    data = _disk_read(url)
+    if data is not None:
+        return data
     settings = get_settings()
-    cached = _cache_get(url)
-    if cached is not None:
-        return cached
     session = _get_session()
+    resource = _resource_label(url)
+    started = time.perf_counter()
     try:
-        resp = session.get(url, timeout=settings.request_timeout_seconds)
+        resp = session.get(
+            url,
+            headers=_conditional_headers(entry),
+            timeout=settings.request_timeout_seconds,
+        )
+        # urllib3 retries inside session.get; its history says how many.
+        retries = getattr(getattr(resp.raw, "retries", None), "history", ())
+        metrics.record_retries(resource, len(retries))
+        _record_upstream(resource, str(resp.status_code), time.perf_counter() - started)
         resp.raise_for_status()
     except requests.HTTPError as e:
         if e.response is not None and e.response.status_code == 404:
-            raise SWAPINotFoundError(f"Resource not found: {url}") from e
+            raise _cache_not_found(url) from e
         raise SWAPIClientError(f"SWAPI error: {e}") from e
     except requests.RequestException as e:
+        from urllib3.exceptions import MaxRetryError
+
+        if e.args and isinstance(e.args[0], MaxRetryError):
+            # urllib3 gave up with no response to read the history from:
+            # every configured retry was spent (the async client counts each).
+            metrics.record_retries(resource, settings.request_retries)
+        _record_upstream(resource, "error", time.perf_counter() - started)
         raise SWAPIClientError(f"SWAPI request failed: {e}") from e
+    if resp.status_code == 304 and entry is not None:
+        return _revalidated(url, entry)
     data = resp.json()
-    _cache_set(url, data, settings.cache_ttl_seconds)
+    _store(url, data, resp.content, _validators(resp.headers))
     return data
 
 
-def get_resource(resource: str, resource_id: int | None = None) -> dict[str, Any]:
-    """Fetch a single resource or list (with optional page)."""
+def _get(url: str) -> dict[str, Any]:
+    if get_settings().swapi_mode == "snapshot":
+        return _snapshot_get(url)
+    entry = _cache_entry(url)
+    if entry is not None and entry.is_valid():
+        return _cached_value(url, entry)
+    if _serve_while_revalidating(entry):
+        _refresh_in_background(url, entry)
+        _count("stale_served")
+        metrics.record_lookup(_resource_label(url), "stale")
+        return entry.data
+    future, is_leader = _join_inflight(url)
+    metrics.record_lookup(_resource_label(url), "miss" if is_leader else "coalesced")
+    if not is_leader:
+        try:
+            return future.result()
+        except SWAPIClientError as e:
+            return _stale_or_raise(entry, e)
+    try:
+        try:
+            data = _fetch(url, entry)
+        except SWAPIClientError as e:
+            data = _stale_or_raise(entry, e)
+    except BaseException as e:
+        _finish_inflight(url, future, error=e)
+        raise
+    _finish_inflight(url, future, data)
+    return data
+
+
+def _refresh_in_background(url: str, entry: CacheEntry) -> None:
+    future = _try_lead(url)
+    if future is None:
+        return
+    _count("background_refreshes")
+    threading.Thread(
+        target=_refresh,
+        args=(url, future, entry),
+        name="swapi-refresh",
+        daemon=True,
+    ).start()
+
+
+def _refresh(url: str, future: Future, entry: CacheEntry) -> None:
+    try:
+        data = _fetch(url, entry)
+    except BaseException as e:
+        _finish_inflight(url, future, error=e)
+        return
+    _finish_inflight(url, future, data)
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Sleep before retry ``attempt`` (1-based), matching urllib3's Retry."""
+    if attempt <= 1:
+        return 0.0
+    return _BACKOFF_FACTOR * (2 ** (attempt - 1))
+
+
+async def _afetch(url: str, entry: CacheEntry | None = None) -> dict[str, Any]:
+    """Async ``_fetch``: disk tier, then SWAPI, revalidating ``entry`` if given."""
+    import httpx
+
+    if get_settings().cache_disk_path:
+        # Opening and reading SQLite both block (up to its 5 s lock wait):
+        # keep them off the event loop.
+        data = await asyncio.to_thread(_disk_read, url)
+        if data is not None:
+            return data
+    settings = get_settings()
+    client = _get_async_client()
+    headers = _conditional_headers(entry)
+    resource = _resource_label(url)
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            resp = await client.get(url, headers=headers)
+        except httpx.TransportError as e:
+            _record_upstream(resource, "error", time.perf_counter() - started)
+            if attempt >= settings.request_retries:
+                raise SWAPIClientError(f"SWAPI request failed: {e}") from e
+        else:
+            _record_upstream(resource, str(resp.status_code), time.perf_counter() - started)
+            if resp.status_code not in _RETRY_STATUSES or attempt >= settings.request_retries:
+                break
+        attempt += 1
+        metrics.record_retries(resource)
+        await asyncio.sleep(_backoff_seconds(attempt))
+    if resp.status_code == 304 and entry is not None:
+        return _revalidated(url, entry)
+    if resp.status_code == 404:
+        raise _cache_not_found(url)
+    if resp.status_code >= 400:
+        raise SWAPIClientError(
+            f"SWAPI error: {resp.status_code} {resp.reason_phrase} for url: {url}"
+        )
+    data = resp.json()
+    _store(url, data, resp.content, _validators(resp.headers))
+    return data
+
+
+async def _aget(url: str) -> dict[str, Any]:
+    if get_settings().swapi_mode == "snapshot":
+        return _snapshot_get(url)
+    entry = _cache_entry(url)
+    if entry is not None and entry.is_valid():
+        return _cached_value(url, entry)
+    if _serve_while_revalidating(entry):
+        _arefresh_in_background(url, entry)
+        _count("stale_served")
+        metrics.record_lookup(_resource_label(url), "stale")
+        return entry.data
+    future, is_leader = _join_inflight(url)
+    metrics.record_lookup(_resource_label(url), "miss" if is_leader else "coalesced")
+    if is_leader:
+        # The fetch runs in its own task, so cancelling the caller that
+        # started it (e.g. a disconnected stream) doesn't abort it for the
+        # followers waiting on the same URL.
+        _spawn(_arefresh(url, future, entry))
+    try:
+        # shield: a cancelled caller must not cancel the shared future.
+        return await asyncio.shield(asyncio.wrap_future(future))
+    except SWAPIClientError as e:
+        return _stale_or_raise(entry, e)
+
+
+def _spawn(coro: Any) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _arefresh_in_background(url: str, entry: CacheEntry) -> None:
+    future = _try_lead(url)
+    if future is None:
+        return
+    _count("background_refreshes")
+    _spawn(_arefresh(url, future, entry))
+
+
+async def _arefresh(url: str, future: Future, entry: CacheEntry | None) -> None:
+    try:
+        data = await _afetch(url, entry)
+    except BaseException as e:
+        _finish_inflight(url, future, error=e)
+        return
+    _finish_inflight(url, future, data)
+
+
+def _resource_url(resource: str, resource_id: int | None = None) -> str:
     settings = get_settings()
     base = f"{settings.swapi_base_url}/{resource.rstrip('/')}"
     if resource_id is not None:
-        url = f"{base}/{resource_id}/"
-    else:
-        url = f"{base}/"
-    return _get(url)
+        return f"{base}/{resource_id}/"
+    return f"{base}/"
 
 
-def get_list(
+def _list_url(
     resource: str,
     page: int | None = None,
     search: str | None = None,
-) -> dict[str, Any]:
-    """Fetch paginated list with optional search."""
+) -> str:
     settings = get_settings()
     url = f"{settings.swapi_base_url}/{resource.rstrip('/')}/"
     params: list[tuple[str, str]] = []
@@ -122,12 +674,76 @@ def get_list(
         params.append(("search", search))
     if params:
         url += "?" + "&".join(f"{k}={v}" for k, v in params)
-    return _get(url)
+    return url
 
 
-def get_by_url(url: str) -> dict[str, Any]:
-    """Fetch any SWAPI URL (for resolving related resources)."""
+def _absolute_url(url: str) -> str:
     if not url.startswith(("http://", "https://")):
         settings = get_settings()
         url = f"{settings.swapi_base_url}/{url.lstrip('/')}"
-    return _get(url)
+    return url
+
+
+def _check_id(resource: str, resource_id: int | None) -> None:
+    # SWAPI ids start at 1; anything lower is a 404 without asking upstream.
+    if resource_id is not None and resource_id < 1:
+        raise SWAPINotFoundError(f"Resource not found: {resource}/{resource_id}")
+
+
+def get_resource(resource: str, resource_id: int | None = None) -> dict[str, Any]:
+    """Fetch a single resource or list (with optional page)."""
+    _check_id(resource, resource_id)
+    return _get(_resource_url(resource, resource_id))
+
+
+def get_list(
+    resource: str,
+    page: int | None = None,
+    search: str | None = None,
+) -> dict[str, Any]:
+    """Fetch paginated list with optional search."""
+    return _get(_list_url(resource, page, search))
+
+
+def get_by_url(url: str) -> dict[str, Any]:
+    """Fetch any SWAPI URL (for resolving related resources)."""
+    return _get(_absolute_url(url))
+
+
+async def aget_resource(resource: str, resource_id: int | None = None) -> dict[str, Any]:
+    """Async variant of :func:`get_resource`."""
+    _check_id(resource, resource_id)
+    return await _aget(_resource_url(resource, resource_id))
+
+
+async def aget_list(
+    resource: str,
+    page: int | None = None,
+    search: str | None = None,
+) -> dict[str, Any]:
+    """Async variant of :func:`get_list`."""
+    return await _aget(_list_url(resource, page, search))
+
+
+async def aget_by_url(url: str) -> dict[str, Any]:
+    """Async variant of :func:`get_by_url`."""
+    return await _aget(_absolute_url(url))
+
+
+async def aget_many(urls: list[str], return_exceptions: bool = False) -> list[Any]:
+    """Resolve many SWAPI URLs concurrently, keeping input order.
+
+    At most ``fanout_concurrency`` fetches run at once. With
+    ``return_exceptions`` the failed slots hold the raised exception instead
+    of aborting the whole batch (same contract as ``asyncio.gather``).
+    """
+    semaphore = asyncio.Semaphore(max(1, get_settings().fanout_concurrency))
+
+    async def fetch(url: str) -> dict[str, Any]:
+        async with semaphore:
+            return await aget_by_url(url)
+
+    return await asyncio.gather(
+        *(fetch(u) for u in urls),
+        return_exceptions=return_exceptions,
+    )
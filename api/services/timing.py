@@ -0,0 +1,89 @@
+"""Per-request phase timings: cache, upstream, sort, expand, serialize.
+
+A :class:`RequestTimings` lives in a context variable while a request is
+served (set by ``ServerTimingMiddleware``); code on the request path adds to
+it with :func:`phase` or :func:`record`. Tasks spawned by the request copy the
+context, so concurrent upstream calls all land in the same request and a
+phase can add up to more than the wall time. ``expand`` includes the cache
+and upstream time of the URLs it resolves. Outside a request every call is a
+no-op.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+# Emitted first, in this order; other phases follow in the order first seen.
+_PHASES = ("cache", "upstream", "sort", "expand", "serialize")
+
+
+class RequestTimings:
+    """Seconds spent per phase, and SWAPI requests made, for one request."""
+
+    __slots__ = ("phases", "upstream_calls")
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.upstream_calls = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """``Server-Timing`` value (durations in ms); ``app`` is the whole request."""
+        names = [p for p in _PHASES if p in self.phases or p == "upstream"]
+        names += [p for p in self.phases if p not in _PHASES]
+        parts = []
+        for name in names:
+            part = f"{name};dur={self.phases.get(name, 0.0) * 1000:.2f}"
+            if name == "upstream":
+                part += f';desc="{self.upstream_calls} calls"'
+            parts.append(part)
+        parts.append(f"app;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def begin() -> tuple[RequestTimings, Token]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+def record(name: str, seconds: float) -> None:
+    """Add ``seconds`` to phase ``name`` of the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def record_upstream(seconds: float) -> None:
+    """One HTTP request to SWAPI made for the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add("upstream", seconds)
+        timings.upstream_calls += 1
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as phase ``name`` of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
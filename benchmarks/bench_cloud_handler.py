@@ -0,0 +1,58 @@
+"""Per-request overhead of the Cloud Functions entrypoint: TestClient vs ASGI bridge.
+
+Dispatches ``GET /health`` (no upstream I/O) through the previous
+TestClient-per-invocation handler and through ``cloud_function_handler``.
+
+Usage: python -m benchmarks.bench_cloud_handler [-n 2000]
+"""
+
+import argparse
+import time
+
+from api.main import app, cloud_function_handler
+
+
+class _Request:
+    path = "/health"
+    query_string = b""
+    method = "GET"
+    scheme = "https"
+    remote_addr = "127.0.0.1"
+    headers = {"host": "bench.local"}
+
+    def get_data(self) -> bytes:
+        return b""
+
+
+def testclient_handler(request):
+    """The handler as it was before the bridge: a new TestClient per call."""
+    from starlette.testclient import TestClient
+
+    client = TestClient(app)
+    response = client.request(request.method, request.path, content=request.get_data())
+    return (response.content, response.status_code, dict(response.headers))
+
+
+def bench(handler, n: int) -> float:
+    request = _Request()
+    handler(request)  # warm-up: imports, loop start
+    start = time.perf_counter()
+    for _ in range(n):
+        _, status, _ = handler(request)
+        assert status == 200
+    return (time.perf_counter() - start) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="requests per handler")
+    args = parser.parse_args()
+    before = bench(testclient_handler, args.n)
+    after = bench(cloud_function_handler, args.n)
+    print(f"TestClient per request: {before * 1e6:9.1f} us/request")
+    print(f"ASGI bridge:            {after * 1e6:9.1f} us/request")
+    print(f"speedup:                {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
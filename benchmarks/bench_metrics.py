@@ -0,0 +1,75 @@
+"""Instrumentation overhead: metric updates and a cached request with metrics on vs off.
+
+Serves ``GET /films/1`` from the SWAPI cache through ``cloud_function_handler``
+(the upstream response is mocked once with respx, then every request is a
+cache hit), so the difference between the two runs is the metrics work:
+middleware timing, one lookup counter and the request counter/histogram.
+
+Usage: python -m benchmarks.bench_metrics [-n 5000]
+"""
+
+import argparse
+import time
+
+import respx
+
+from api.config import get_settings
+from api.main import cloud_function_handler
+from api.services import metrics
+
+
+class _Request:
+    path = "/films/1"
+    query_string = b""
+    method = "GET"
+    scheme = "https"
+    remote_addr = "127.0.0.1"
+    headers = {"host": "bench.local"}
+
+    def get_data(self) -> bytes:
+        return b""
+
+
+def per_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def bench_requests(n: int, enabled: bool) -> float:
+    get_settings().metrics_enabled = enabled
+    request = _Request()
+
+    def call() -> None:
+        _, status, _ = cloud_function_handler(request)
+        assert status == 200
+
+    call()
+    return per_call(call, n)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=5000, help="requests per run")
+    args = parser.parse_args()
+    counter = metrics.Counter("bench_total", "bench", ("resource", "result"))
+    histogram = metrics.Histogram("bench_seconds", "bench", ("resource",))
+    inc = per_call(lambda: counter.inc("films", "hit"), 100_000)
+    observe = per_call(lambda: histogram.observe(0.003, "films"), 100_000)
+    with respx.mock:
+        respx.get(f"{get_settings().swapi_base_url}/films/1/").respond(
+            json={"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+        )
+        cloud_function_handler(_Request())
+        off = min(bench_requests(args.n, False) for _ in range(3))
+        on = min(bench_requests(args.n, True) for _ in range(3))
+    print(f"Counter.inc:          {inc * 1e9:9.0f} ns")
+    print(f"Histogram.observe:    {observe * 1e9:9.0f} ns")
+    print(f"request, metrics off: {off * 1e6:9.1f} us/request")
+    print(f"request, metrics on:  {on * 1e6:9.1f} us/request")
+    print(f"overhead:             {(on - off) * 1e6:9.1f} us/request ({(on / off - 1) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Cold start of the Cloud Functions entrypoint, measured in fresh interpreters.
+
+Each run spawns a new Python process that imports ``main`` (as the Functions
+Framework does) and dispatches ``GET /health`` through
+``cloud_function_handler``. Reports the median import time and time to first
+response (interpreter startup excluded), which upstream transport modules
+were loaded eagerly by the import, and the heaviest modules in one
+``python -X importtime -c "import main"`` run.
+
+Usage: python -m benchmarks.bench_startup [-n 5] [--budget SECONDS] [--imports 15]
+
+With ``--budget`` the exit status is 1 when the median time to first response
+exceeds it, so the benchmark can gate CI against cold-start regressions. The
+budget lives here rather than in the test suite: wall-clock limits are noise
+on slow CI runners.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that should only load when the first upstream call needs them.
+LAZY_MODULES = ("requests", "urllib3", "httpx", "sqlite3")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+eager = [m for m in {lazy!r} if m in sys.modules]
+
+class Request:
+    path = "/health"
+    query_string = b""
+    method = "GET"
+    scheme = "https"
+    remote_addr = "127.0.0.1"
+    headers = {{"host": "bench.local"}}
+
+    def get_data(self):
+        return b""
+
+_, status, _ = main.cloud_function_handler(Request())
+t2 = time.perf_counter()
+assert status == 200, status
+print(json.dumps({{"import": t1 - t0, "first_response": t2 - t0, "eager": eager}}))
+"""
+
+
+# "import time:  self [us] |  cumulative | <indent>module" (stderr of -X importtime)
+_MARKER = "-- import main --"
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_breakdown() -> list[dict]:
+    """Every module ``import main`` loads, from ``python -X importtime``.
+
+    One dict per module: ``module``, ``self``/``cumulative`` seconds and
+    ``depth`` (0 for ``main`` itself, 1 for ``api.main``, 2 for what that
+    imports first).
+    """
+    out = subprocess.run(
+        # The marker separates interpreter startup imports from main's.
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.stderr.write('{_MARKER}\\n'); import main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in out.stderr.partition(_MARKER)[2].splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self": int(own) / 1e6,
+                "cumulative": int(cumulative) / 1e6,
+                "depth": len(indent) // 2,
+            })
+    return modules
+
+
+def probe() -> dict:
+    """One cold start in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(lazy=LAZY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(runs: int) -> dict:
+    """Median import / first-response seconds over ``runs`` cold starts."""
+    samples = [probe() for _ in range(runs)]
+    return {
+        "import": statistics.median(s["import"] for s in samples),
+        "first_response": statistics.median(s["first_response"] for s in samples),
+        "eager": sorted({m for s in samples for m in s["eager"]}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=5, help="cold starts to sample")
+    parser.add_argument("--budget", type=float, help="max median seconds to first response")
+    parser.add_argument("--imports", type=int, default=15, help="heaviest imports to list (0: skip)")
+    args = parser.parse_args()
+    result = measure(args.n)
+    print(f"import main:        {result['import'] * 1e3:8.1f} ms")
+    print(f"first response:     {result['first_response'] * 1e3:8.1f} ms")
+    print(f"eager transports:   {', '.join(result['eager']) or 'none'}")
+    if args.imports > 0:
+        modules = import_breakdown()
+        print(f"\nheaviest imports (self / cumulative ms, one -X importtime run):")
+        for m in sorted(modules, key=lambda m: m["self"], reverse=True)[:args.imports]:
+            print(f"  {m['self'] * 1e3:7.1f} {m['cumulative'] * 1e3:8.1f}  {m['module']}")
+        # main only re-exports api.main: break down what api.main pulls in.
+        print("first imported by api.main (cumulative ms):")
+        direct = [m for m in modules if m["depth"] == 2]
+        for m in sorted(direct, key=lambda m: m["cumulative"], reverse=True):
+            print(f"  {m['cumulative'] * 1e3:8.1f}  {m['module']}")
+    if args.budget is not None and result["first_response"] > args.budget:
+        print(f"FAIL: over budget of {args.budget * 1e3:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
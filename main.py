@@ -3,8 +3,15 @@
 The framework looks for main.py at the project root and the entry point
 function (cloud_function_handler). We re-export from api.main so that
 the same code runs locally via uvicorn (api.main:app) and on GCF.
+
+The app's lifespan starts on the bridge loop as soon as the instance loads
+this module: with PREWARM=1 the upstream client (and PREWARM_COLLECTIONS) is
+initialized in the background, and at exit the client is closed and
+disk-cache writes are flushed.
 """
 
-from api.main import cloud_function_handler
+from api.main import cloud_function_handler, start_lifespan
+
+start_lifespan()
 
 __all__ = ["cloud_function_handler"]
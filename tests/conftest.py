@@ -1,18 +1,30 @@
-"""Pytest fixtures: mock SWAPI, FastAPI test client."""
+"""Pytest fixtures: mock SWAPI, FastAPI test client.
+
+Routers use the async (httpx) client, mocked with ``respx``; the sync
+(requests) client is mocked with ``responses``.
+"""
 
 import pytest
-import responses
+import respx
 
 from fastapi.testclient import TestClient
 
+from api.encoding import clear_encoded_cache
 from api.main import app
+from api.middleware import clear_compressed_cache
+from api.services import catalog, metrics, profiler
 from api.services.swapi_client import clear_cache
 
 
 @pytest.fixture(autouse=True)
 def clear_swapi_cache():
-    """Clear SWAPI cache before each test so mocks are used."""
+    """Clear SWAPI cache, loaded collections, encoded/compressed bodies, metrics and written profiles before each test so mocks are used."""
     clear_cache()
+    catalog.clear()
+    clear_encoded_cache()
+    clear_compressed_cache()
+    metrics.REGISTRY.clear()
+    profiler.clear_written()
     yield
 
 
@@ -24,24 +36,24 @@ def client() -> TestClient:
 
 @pytest.fixture
 def mock_swapi():
-    """Context manager that mocks SWAPI base URL for responses library."""
-    with responses.RequestsMock() as rsps:
+    """Context manager that mocks SWAPI base URL for the async client."""
+    with respx.mock() as rsps:
         yield rsps
 
 
-def add_swapi_list(rsps: responses.RequestsMock, resource: str, results: list[dict], next_url: str | None = None) -> None:
+def add_swapi_list(rsps: respx.MockRouter, resource: str, results: list[dict], next_url: str | None = None) -> None:
     """Register mock for SWAPI list endpoint."""
     url = f"https://swapi.dev/api/{resource}/"
     body = {"count": len(results), "results": results, "next": next_url, "previous": None}
-    rsps.add(responses.GET, url, json=body, status=200)
+    rsps.get(url).respond(200, json=body)
 
 
-def add_swapi_resource(rsps: responses.RequestsMock, resource: str, resource_id: int, data: dict) -> None:
+def add_swapi_resource(rsps: respx.MockRouter, resource: str, resource_id: int, data: dict) -> None:
     """Register mock for SWAPI single resource."""
     url = f"https://swapi.dev/api/{resource}/{resource_id}/"
-    rsps.add(responses.GET, url, json=data, status=200)
+    rsps.get(url).respond(200, json=data)
 
 
-def add_swapi_url(rsps: responses.RequestsMock, url: str, data: dict) -> None:
+def add_swapi_url(rsps: respx.MockRouter, url: str, data: dict) -> None:
     """Register mock for any SWAPI URL."""
-    rsps.add(responses.GET, url, json=data, status=200)
+    rsps.get(url).respond(200, json=data)
@@ -0,0 +1,79 @@
+"""Tests for batch router."""
+
+import respx
+
+
+@respx.mock
+def test_batch_resolves_pairs_and_urls_in_order(client):
+    luke = respx.get("https://swapi.dev/api/people/1/").respond(
+        200, json={"name": "Luke Skywalker", "height": "172"}
+    )
+    respx.get("https://swapi.dev/api/planets/1/").respond(200, json={"name": "Tatooine"})
+    r = client.post(
+        "/batch",
+        json={
+            "items": [
+                {"resource": "people", "id": 1},
+                {"url": "https://swapi.dev/api/planets/1/"},
+                {"url": "https://swapi.dev/api/people/1/"},
+            ],
+            "fields": "name",
+        },
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["count"] == 3
+    assert [item["data"] for item in data["results"]] == [
+        {"name": "Luke Skywalker"},
+        {"name": "Tatooine"},
+        {"name": "Luke Skywalker"},
+    ]
+    assert data["results"][1]["resource"] == "planets"
+    assert luke.call_count == 1
+
+
+@respx.mock
+def test_batch_reports_errors_per_item(client):
+    respx.get("https://swapi.dev/api/people/1/").respond(200, json={"name": "Luke Skywalker"})
+    respx.get("https://swapi.dev/api/people/999/").respond(404)
+    r = client.post(
+        "/batch",
+        json={
+            "items": [
+                {"resource": "people", "id": 1},
+                {"resource": "people", "id": 999},
+                {"url": "https://example.com/not-swapi"},
+            ]
+        },
+    )
+    assert r.status_code == 200
+    statuses = [item["status"] for item in r.json()["results"]]
+    assert statuses == [200, 404, 400]
+
+
+@respx.mock
+def test_batch_maps_unexpected_failures_to_502(client):
+    respx.get("https://swapi.dev/api/people/1/").respond(200, json={"name": "Luke Skywalker"})
+    respx.get("https://swapi.dev/api/people/2/").mock(side_effect=RuntimeError("boom"))
+    r = client.post(
+        "/batch",
+        json={"items": [{"resource": "people", "id": 1}, {"resource": "people", "id": 2}]},
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [item["status"] for item in results] == [200, 502]
+    assert results[1]["error"] == "Upstream error"
+
+
+def test_batch_validates_items(client):
+    assert client.post("/batch", json={"items": []}).status_code == 422
+    assert client.post("/batch", json={"items": [{"resource": "people"}]}).status_code == 422
+    assert client.post("/batch", json={"items": [{"resource": "droids", "id": 1}]}).status_code == 422
+    url = "https://swapi.dev/api/people/1/"
+    for item in (
+        {"url": url, "resource": "people"},
+        {"url": url, "id": 1},
+        {"url": url, "resource": "people", "id": 1},
+        {"id": 1},
+    ):
+        assert client.post("/batch", json={"items": [item]}).status_code == 422
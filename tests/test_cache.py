@@ -0,0 +1,64 @@
+"""Tests for the bounded TTL cache."""
+
+from api.services.cache import TTLCache
+
+
+def test_lru_eviction_by_entry_count():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, 60, size=1)
+    cache.set("b", 2, 60, size=1)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3, 60, size=1)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_byte_budget():
+    cache = TTLCache(max_bytes=100)
+    cache.set("a", "x", 60, size=60)
+    cache.set("b", "y", 60, size=60)
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 60
+
+
+def test_expired_entry_is_a_miss():
+    cache = TTLCache()
+    cache.set("a", 1, 0, size=1)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["entries"] == 0
+    assert stats["expirations"] == 1
+
+
+def test_sweep_drops_expired_keys_that_are_never_read():
+    cache = TTLCache(sweep_interval_seconds=0)
+    cache.set("old", 1, 0, size=10)
+    cache.set("new", 2, 60, size=10)
+    assert "old" not in cache
+    assert cache.stats()["bytes"] == 10
+
+
+def test_stats_hit_ratio():
+    cache = TTLCache()
+    cache.set("a", {"name": "Luke"}, 60)
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 2 / 3
+    assert stats["bytes"] > 0
+
+
+def test_renew_extends_retained_entry_in_place():
+    cache = TTLCache()
+    data = {"name": "Luke"}
+    cache.set("a", data, 0, stale_seconds=60, validators={"etag": '"v1"'})
+    assert cache.get("a") is None
+    assert cache.renew("a", 60, 60)
+    assert cache.get("a") is data
+    assert cache.get_entry("a").validators == {"etag": '"v1"'}
+    assert not cache.renew("missing", 60)
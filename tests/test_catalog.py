@@ -0,0 +1,51 @@
+"""Tests for the in-memory collections' presorted views."""
+
+import pytest
+import respx
+
+from api.services import catalog
+from api.services.formatters import sort_results
+
+BASE = "https://swapi.dev/api"
+
+
+def _mock_people(people):
+    respx.get(f"{BASE}/people/").respond(
+        200,
+        json={"count": len(people), "results": people, "next": None, "previous": None},
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_sorted_records_match_sort_results_and_are_cached():
+    people = [
+        {"name": "Luke", "mass": "77", "url": f"{BASE}/people/1/"},
+        {"name": "Jabba", "mass": "1,358", "url": f"{BASE}/people/16/"},
+        {"name": "Yoda", "mass": "unknown", "url": f"{BASE}/people/20/"},
+        {"name": "Leia", "mass": "49", "url": f"{BASE}/people/5/"},
+        {"name": "R2-D2", "mass": "32", "url": f"{BASE}/people/3/"},
+    ]
+    _mock_people(people)
+    await catalog.aget_collection("people")
+    for descending in (False, True):
+        expected = sort_results(list(people), "mass", "desc" if descending else "asc")
+        assert catalog.sorted_records("people", "mass", descending) == expected
+    assert catalog.sorted_records("people", "mass") is catalog.sorted_records("people", "mass")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_sorting_by_unknown_fields_is_not_cached():
+    people = [
+        {"name": "Luke", "url": f"{BASE}/people/1/"},
+        {"name": "Leia", "url": f"{BASE}/people/5/"},
+    ]
+    _mock_people(people)
+    records = await catalog.aget_collection("people")
+    for field in ("nope", "x" * 50, "__class__"):
+        for descending in (False, True):
+            ordered = catalog.sorted_records("people", field, descending)
+            assert ordered == sort_results(list(people), field, "desc" if descending else "asc")
+            # The collection itself: no sorted copy was built or kept.
+            assert ordered is records
@@ -0,0 +1,90 @@
+"""Tests for the on-disk cache tier."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+import respx
+
+from api.services import swapi_client
+from api.services.disk_cache import DiskCache
+
+
+def test_entries_survive_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = DiskCache(path)
+    first.put("https://swapi.dev/api/films/1/", b'{"title": "A New Hope"}', 60, {"etag": '"v1"'})
+    first.flush()
+    body, remaining, validators = DiskCache(path).get("https://swapi.dev/api/films/1/")
+    assert body == b'{"title": "A New Hope"}'
+    assert 0 < remaining <= 60
+    assert validators == {"etag": '"v1"'}
+
+
+def test_files_without_validators_column_are_migrated(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE responses (url TEXT PRIMARY KEY, body BLOB NOT NULL, expires_at REAL NOT NULL)")
+    conn.execute("INSERT INTO responses VALUES (?, ?, ?)", ("u", b"{}", time.time() + 60))
+    conn.commit()
+    conn.close()
+    assert DiskCache(path).get("u")[2] is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("https://swapi.dev/api/films/1/", b"{}", 0)
+    cache.flush()
+    assert cache.get("https://swapi.dev/api/films/1/") is None
+
+
+@pytest.fixture
+def disk_tier(tmp_path, monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "cache_disk_path", str(tmp_path / "c.sqlite3"))
+    yield
+    monkeypatch.undo()
+    swapi_client._get_disk_cache()  # settings changed back: drops the tmp DiskCache
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_reads_through_disk_after_memory_is_cleared(disk_tier):
+    route = respx.get("https://swapi.dev/api/films/1/").respond(200, json={"title": "A New Hope"})
+    await swapi_client.aget_resource("films", 1)
+    swapi_client.flush_disk_cache()
+    swapi_client.clear_cache()  # simulates a cold start with a warm volume
+    assert (await swapi_client.aget_resource("films", 1))["title"] == "A New Hope"
+    assert route.call_count == 1
+    assert swapi_client.cache_stats()["disk"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_disk_hit_keeps_validators_for_revalidation(disk_tier):
+    url = "https://swapi.dev/api/films/1/"
+    respx.get(url).respond(200, json={"title": "A New Hope"}, headers={"ETag": '"v1"'})
+    await swapi_client.aget_resource("films", 1)
+    swapi_client.flush_disk_cache()
+    swapi_client.clear_cache()
+    await swapi_client.aget_resource("films", 1)  # promoted from disk
+    entry = swapi_client._cache_entry(url)
+    assert entry.validators == {"etag": '"v1"'}
+    assert swapi_client._conditional_headers(entry) == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_disk_tier_is_opened_off_the_event_loop(disk_tier, monkeypatch):
+    opened_on = []
+    original = DiskCache.__init__
+
+    def recording_init(self, *args, **kwargs):
+        opened_on.append(threading.get_ident())
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(DiskCache, "__init__", recording_init)
+    respx.get("https://swapi.dev/api/films/1/").respond(200, json={"title": "A New Hope"})
+    await swapi_client.aget_resource("films", 1)
+    assert len(opened_on) == 1
+    assert opened_on[0] != threading.get_ident()
@@ -0,0 +1,37 @@
+"""Tests for orjson responses and the pre-encoded body cache."""
+
+import orjson
+
+from api.encoding import ORJSONResponse, encode_cached, encoded_cache_stats
+
+
+def test_orjson_response_renders_json():
+    response = ORJSONResponse({"name": "Luke", "films": []})
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == {"name": "Luke", "films": []}
+
+
+def test_encode_cached_reuses_bytes_for_same_object():
+    data = {"title": "A New Hope"}
+    first, etag = encode_cached("films/1", data)
+    assert encode_cached("films/1", data) == (first, etag)
+    assert encode_cached("films/1", data)[0] is first
+    assert encoded_cache_stats()["hits"] == 2
+
+
+def test_encode_cached_reencodes_when_object_is_replaced():
+    encode_cached("films/1", {"title": "A New Hope"})
+    body, _ = encode_cached("films/1", {"title": "A New Hope (remastered)"})
+    assert orjson.loads(body) == {"title": "A New Hope (remastered)"}
+
+
+def test_detail_route_serves_pre_encoded_body(client, mock_swapi):
+    mock_swapi.get("https://swapi.dev/api/films/1/").respond(
+        json={"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+    )
+    first = client.get("/films/1")
+    second = client.get("/films/1")
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert second.json()["title"] == "A New Hope"
+    assert encoded_cache_stats()["hits"] == 1
@@ -0,0 +1,71 @@
+"""Tests for export router."""
+
+import csv
+import io
+import json
+
+import respx
+
+from api.config import get_settings
+from api.services.snapshot import RESOURCES
+
+
+def _mock_collection(resource, results):
+    return respx.get(f"https://swapi.dev/api/{resource}/").respond(
+        200, json={"count": len(results), "results": results, "next": None, "previous": None}
+    )
+
+
+PEOPLE = [
+    {"name": "Luke Skywalker", "hair_color": "blond", "films": ["https://swapi.dev/api/films/1/", "https://swapi.dev/api/films/2/"]},
+    {"name": "Leia Organa", "hair_color": "brown", "films": ["https://swapi.dev/api/films/1/"]},
+]
+
+
+@respx.mock
+def test_export_resource_ndjson_from_catalog(client):
+    route = _mock_collection("people", PEOPLE)
+    r = client.get("/export/people")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert r.headers["content-disposition"] == 'attachment; filename="people.ndjson"'
+    assert [json.loads(line) for line in r.text.splitlines()] == PEOPLE
+    client.get("/export/people?fields=name")
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_export_resource_csv_with_fields(client):
+    _mock_collection("people", PEOPLE)
+    r = client.get("/export/people?format=csv&fields=name,films")
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(r.text)))
+    assert rows == [
+        ["name", "films"],
+        ["Luke Skywalker", "https://swapi.dev/api/films/1/ https://swapi.dev/api/films/2/"],
+        ["Leia Organa", "https://swapi.dev/api/films/1/"],
+    ]
+
+
+@respx.mock
+def test_export_all_tags_each_row_with_resource(client):
+    for resource in RESOURCES:
+        _mock_collection(resource, [{"name": f"{resource} one"}] if resource != "films" else [{"title": "A New Hope"}])
+    r = client.get("/export?format=csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["resource"] for row in rows] == list(RESOURCES)
+    assert rows[0] == {"resource": "films", "title": "A New Hope", "name": ""}
+    ndjson = client.get("/export?fields=name").text.splitlines()
+    assert json.loads(ndjson[1]) == {"resource": "people", "name": "people one"}
+
+
+def test_export_unknown_resource_is_422(client):
+    assert client.get("/export/droids").status_code == 422
+    assert client.get("/export/people?format=xml").status_code == 422
+
+
+@respx.mock
+def test_export_upstream_failure_is_502(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "request_retries", 0)
+    respx.get("https://swapi.dev/api/planets/").respond(500)
+    assert client.get("/export/planets").status_code == 502
@@ -1,20 +1,18 @@
 """Tests for films router."""
 
-import responses
+import respx
 
 
-@responses.activate
+@respx.mock
 def test_list_films(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/films/",
+    respx.get("https://swapi.dev/api/films/").respond(
+        200,
         json={
             "count": 1,
             "results": [{"title": "A New Hope", "episode_id": 4, "url": "https://swapi.dev/api/films/1/"}],
             "next": None,
             "previous": None,
         },
-        status=200,
     )
     r = client.get("/films")
     assert r.status_code == 200
@@ -24,31 +22,28 @@ def test_list_films(client):
     assert data["results"][0]["title"] == "A New Hope"
 
 
-@responses.activate
+@respx.mock
 def test_get_film_by_id(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/films/1/",
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        200,
         json={"title": "A New Hope", "episode_id": 4, "url": "https://swapi.dev/api/films/1/"},
-        status=200,
     )
     r = client.get("/films/1")
     assert r.status_code == 200
     assert r.json()["title"] == "A New Hope"
 
 
-@responses.activate
+@respx.mock
 def test_get_film_404(client):
-    responses.add(responses.GET, "https://swapi.dev/api/films/999/", status=404)
+    respx.get("https://swapi.dev/api/films/999/").respond(404)
     r = client.get("/films/999")
     assert r.status_code == 404
 
 
-@responses.activate
+@respx.mock
 def test_get_film_characters_correlated(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/films/1/",
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        200,
         json={
             "title": "A New Hope",
             "characters": [
@@ -56,19 +51,14 @@ def test_get_film_characters_correlated(client):
                 "https://swapi.dev/api/people/2/",
             ],
         },
-        status=200,
     )
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/1/",
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200,
         json={"name": "Luke Skywalker", "url": "https://swapi.dev/api/people/1/"},
-        status=200,
     )
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/2/",
+    respx.get("https://swapi.dev/api/people/2/").respond(
+        200,
         json={"name": "C-3PO", "url": "https://swapi.dev/api/people/2/"},
-        status=200,
     )
     r = client.get("/films/1/characters")
     assert r.status_code == 200
@@ -79,28 +69,22 @@ def test_get_film_characters_correlated(client):
     assert "C-3PO" in names
 
 
-@responses.activate
+@respx.mock
 def test_list_films_filter_by_character_id(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/1/",
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200,
         json={
             "name": "Luke Skywalker",
             "films": ["https://swapi.dev/api/films/1/", "https://swapi.dev/api/films/2/"],
         },
-        status=200,
     )
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/films/1/",
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        200,
         json={"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"},
-        status=200,
     )
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/films/2/",
+    respx.get("https://swapi.dev/api/films/2/").respond(
+        200,
         json={"title": "The Empire Strikes Back", "url": "https://swapi.dev/api/films/2/"},
-        status=200,
     )
     r = client.get("/films?character_id=1")
     assert r.status_code == 200
@@ -109,3 +93,51 @@ def test_list_films_filter_by_character_id(client):
     titles = [f["title"] for f in data["results"]]
     assert "A New Hope" in titles
     assert "The Empire Strikes Back" in titles
+
+
+@respx.mock
+def test_get_film_characters_skips_known_dead_urls(client):
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        200,
+        json={
+            "title": "A New Hope",
+            "characters": [
+                "https://swapi.dev/api/people/1/",
+                "https://swapi.dev/api/people/999/",
+            ],
+        },
+    )
+    respx.get("https://swapi.dev/api/people/1/").respond(200, json={"name": "Luke Skywalker"})
+    dead = respx.get("https://swapi.dev/api/people/999/").respond(404)
+    for _ in range(2):
+        r = client.get("/films/1/characters")
+        assert r.status_code == 200
+        assert [c["name"] for c in r.json()["results"]] == ["Luke Skywalker"]
+    assert dead.call_count == 1
+
+
+@respx.mock
+def test_get_film_nested_expand_with_fields(client):
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        200,
+        json={
+            "title": "A New Hope",
+            "characters": ["https://swapi.dev/api/people/1/"],
+            "planets": ["https://swapi.dev/api/planets/1/"],
+        },
+    )
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200,
+        json={"name": "Luke Skywalker", "height": "172", "homeworld": "https://swapi.dev/api/planets/1/"},
+    )
+    planet = respx.get("https://swapi.dev/api/planets/1/").respond(200, json={"name": "Tatooine"})
+    r = client.get(
+        "/films/1?expand=characters.homeworld,planets"
+        "&fields=title,characters.name,characters.homeworld.name"
+    )
+    assert r.status_code == 200
+    assert r.json() == {
+        "title": "A New Hope",
+        "characters": [{"name": "Luke Skywalker", "homeworld": {"name": "Tatooine"}}],
+    }
+    assert planet.call_count == 1
@@ -1,8 +1,12 @@
-"""Tests for formatters: sort, filter, expand."""
+"""Tests for formatters: sort, filter, expand, project."""
 
+import pytest
+import respx
 import responses
 
-from api.services.formatters import sort_results, filter_people_by_gender, expand_urls
+from api.services.formatters import sort_results, filter_people_by_gender, expand_urls, aexpand_urls
+from api.services.formatters import parse_expand, parse_fields, project, restrict_expand
+from api.services import swapi_client
 
 
 def test_sort_results_by_name_asc():
@@ -56,3 +60,122 @@ def test_expand_urls_resolves_related():
     data = {"homeworld": "https://swapi.dev/api/planets/1/"}
     out = expand_urls(data, {"homeworld"})
     assert out["homeworld"]["name"] == "Tatooine"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aexpand_urls_keeps_order_and_skips_errors():
+    respx.get("https://swapi.dev/api/people/1/").respond(200, json={"name": "Luke"})
+    respx.get("https://swapi.dev/api/people/2/").respond(404)
+    respx.get("https://swapi.dev/api/people/3/").respond(200, json={"name": "R2-D2"})
+    respx.get("https://swapi.dev/api/planets/1/").respond(200, json={"name": "Tatooine"})
+    data = {
+        "characters": [
+            "https://swapi.dev/api/people/1/",
+            "https://swapi.dev/api/people/2/",
+            "https://swapi.dev/api/people/3/",
+        ],
+        "homeworld": "https://swapi.dev/api/planets/1/",
+    }
+    out = await aexpand_urls(data, {"characters", "homeworld"})
+    assert out["characters"] == [
+        {"name": "Luke"},
+        "https://swapi.dev/api/people/2/",
+        {"name": "R2-D2"},
+    ]
+    assert out["homeworld"]["name"] == "Tatooine"
+
+
+def test_parse_fields_builds_projection_tree():
+    assert parse_fields("name, homeworld.name,homeworld.climate") == {
+        "name": None,
+        "homeworld": {"name": None, "climate": None},
+    }
+    assert parse_fields("homeworld.name,homeworld") == {"homeworld": None}
+    assert parse_fields("") is None
+
+
+def test_project_keeps_requested_fields_without_mutating():
+    person = {
+        "name": "Luke",
+        "height": "172",
+        "films": [{"title": "A New Hope", "episode_id": 4}],
+        "homeworld": "https://swapi.dev/api/planets/1/",
+    }
+    projected = project(person, parse_fields("name,films.title,homeworld.name"))
+    assert projected == {
+        "name": "Luke",
+        "films": [{"title": "A New Hope"}],
+        "homeworld": "https://swapi.dev/api/planets/1/",
+    }
+    assert person["films"][0]["episode_id"] == 4
+
+
+def test_restrict_expand_drops_unprojected_relations():
+    assert restrict_expand({"films", "homeworld"}, parse_fields("name,homeworld.name")) == {"homeworld"}
+    assert restrict_expand({"films"}, None) == {"films"}
+    fields = parse_fields("title,characters.name")
+    assert restrict_expand({"characters.homeworld", "planets"}, fields) == {"characters"}
+    assert restrict_expand({"characters.homeworld"}, parse_fields("characters")) == {"characters.homeworld"}
+
+
+def test_parse_expand_is_cut_at_max_depth(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "expand_max_depth", 2)
+    assert parse_expand({"characters.homeworld.residents", "characters.species"}) == {
+        "characters": {"homeworld": {}, "species": {}},
+    }
+
+
+def _film_with_siblings():
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200, json={"name": "Luke", "homeworld": "https://swapi.dev/api/planets/1/"}
+    )
+    respx.get("https://swapi.dev/api/people/2/").respond(
+        200, json={"name": "Owen", "homeworld": "https://swapi.dev/api/planets/1/"}
+    )
+    return {
+        "characters": ["https://swapi.dev/api/people/1/", "https://swapi.dev/api/people/2/"],
+        "planets": ["https://swapi.dev/api/planets/1/"],
+    }
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aexpand_urls_nested_resolves_each_url_once():
+    data = _film_with_siblings()
+    planet = respx.get("https://swapi.dev/api/planets/1/").respond(200, json={"name": "Tatooine"})
+    out = await aexpand_urls(data, {"characters.homeworld", "planets"})
+    assert [c["homeworld"]["name"] for c in out["characters"]] == ["Tatooine", "Tatooine"]
+    assert out["planets"] == [{"name": "Tatooine"}]
+    assert planet.call_count == 1
+    assert data["characters"][0] == "https://swapi.dev/api/people/1/"
+    cached = await swapi_client.aget_by_url("https://swapi.dev/api/people/1/")
+    assert cached["homeworld"] == "https://swapi.dev/api/planets/1/"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aexpand_urls_leaves_urls_past_budget(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "expand_max_urls", 2)
+    data = _film_with_siblings()
+    planet = respx.get("https://swapi.dev/api/planets/1/").respond(200, json={"name": "Tatooine"})
+    out = await aexpand_urls(data, {"characters.homeworld"})
+    assert [c["homeworld"] for c in out["characters"]] == ["https://swapi.dev/api/planets/1/"] * 2
+    assert planet.call_count == 0
+
+
+@responses.activate
+def test_expand_urls_nested_dedups_fetches():
+    responses.add(
+        responses.GET,
+        "https://swapi.dev/api/people/1/",
+        json={"name": "Luke", "homeworld": "https://swapi.dev/api/planets/1/"},
+    )
+    responses.add(responses.GET, "https://swapi.dev/api/planets/1/", json={"name": "Tatooine"})
+    data = {
+        "characters": ["https://swapi.dev/api/people/1/"],
+        "planets": ["https://swapi.dev/api/planets/1/"],
+    }
+    out = expand_urls(data, {"characters.homeworld", "planets"})
+    assert out["characters"][0]["homeworld"]["name"] == "Tatooine"
+    assert len(responses.calls) == 2
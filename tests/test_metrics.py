@@ -0,0 +1,100 @@
+"""Tests for the metrics registry, client instrumentation and /metrics."""
+
+import pytest
+import respx
+import responses
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from api.config import get_settings
+from api.middleware import route_template
+from api.services import metrics, swapi_client
+
+
+def test_registry_renders_prometheus_text():
+    registry = metrics.Registry()
+    counter = registry.counter("demo_total", "Demo counter.", ("resource",))
+    histogram = registry.histogram("demo_seconds", "Demo latency.", buckets=(0.1, 1.0))
+    counter.inc('pe"ople')
+    counter.inc('pe"ople', amount=2)
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{resource="pe\\"ople"} 3' in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 2' in text
+    assert "demo_seconds_count 2" in text
+
+
+@respx.mock
+def test_upstream_calls_are_attributed_to_endpoints(client):
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        json={"title": "A New Hope", "characters": ["https://swapi.dev/api/people/1/"]}
+    )
+    respx.get("https://swapi.dev/api/people/1/").respond(json={"name": "Luke Skywalker"})
+    client.get("/films/1?expand=characters")
+    client.get("/films/1")
+    assert metrics.UPSTREAM_REQUESTS.value("films", "200") == 1
+    assert metrics.UPSTREAM_REQUESTS.value("people", "200") == 1
+    assert metrics.UPSTREAM_LATENCY.count("films") == 1
+    assert metrics.CACHE_LOOKUPS.value("films", "miss") == 1
+    assert metrics.CACHE_LOOKUPS.value("films", "hit") == 1
+    assert metrics.HTTP_UPSTREAM_CALLS.value("/films/{film_id}") == 2
+    assert metrics.HTTP_REQUESTS.value("/films/{film_id}", "GET", "200") == 2
+    r = client.get("/metrics")
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "etag" not in r.headers
+    assert 'swapi_upstream_requests_total{resource="films",status="200"} 1' in r.text
+    assert "swapi_cache_entries 2" in r.text
+
+
+@respx.mock
+def test_retries_and_not_found_are_counted(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "request_retries", 1)
+    route = respx.get("https://swapi.dev/api/planets/1/")
+    route.side_effect = [respx.MockResponse(503), respx.MockResponse(200, json={"name": "Tatooine"})]
+    respx.get("https://swapi.dev/api/planets/99/").respond(404)
+    client.get("/planets/1")
+    client.get("/planets/99")
+    client.get("/planets/99")
+    assert metrics.UPSTREAM_RETRIES.value("planets") == 1
+    assert metrics.UPSTREAM_REQUESTS.value("planets", "503") == 1
+    assert metrics.UPSTREAM_REQUESTS.value("planets", "404") == 1
+    assert metrics.CACHE_LOOKUPS.value("planets", "negative_hit") == 1
+    assert metrics.HTTP_REQUESTS.value("/planets/{planet_id}", "GET", "404") == 2
+
+
+@respx.mock
+def test_disabled_metrics_record_nothing(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "metrics_enabled", False)
+    respx.get("https://swapi.dev/api/films/1/").respond(json={"title": "A New Hope"})
+    client.get("/films/1")
+    assert metrics.UPSTREAM_REQUESTS.value("films", "200") == 0
+    assert metrics.HTTP_REQUESTS.value("/films/{film_id}", "GET", "200") == 0
+
+
+@responses.activate
+def test_sync_retries_are_counted_when_urllib3_gives_up(monkeypatch):
+    monkeypatch.setattr(get_settings(), "request_retries", 2)
+    monkeypatch.setattr(swapi_client, "_session", None)  # rebuilt with the new Retry
+    monkeypatch.setattr(swapi_client, "_BACKOFF_FACTOR", 0)
+    responses.get("https://swapi.dev/api/planets/1/", status=503)
+    with pytest.raises(swapi_client.SWAPIClientError):
+        swapi_client.get_resource("planets", 1)
+    assert len(responses.calls) == 3
+    assert metrics.UPSTREAM_RETRIES.value("planets") == 2
+
+
+def test_route_template_without_route_in_scope():
+    # Older Starlette/FastAPI releases keep a flat route list and don't put
+    # the matched route in the scope.
+    app = Starlette(routes=[Route("/films/{film_id}", lambda request: None)])
+
+    def scope(path, method="GET"):
+        return {"type": "http", "method": method, "path": path, "root_path": "", "app": app}
+
+    assert route_template(scope("/films/1")) == "/films/{film_id}"
+    assert route_template(scope("/films/1", "DELETE")) == "/films/{film_id}"
+    assert route_template(scope("/nope")) == "unmatched"
@@ -0,0 +1,146 @@
+"""Tests for the HTTP middleware: ETag, Cache-Control, 304 and compression."""
+
+import gzip
+
+import pytest
+
+from api.config import get_settings
+from api.middleware import (
+    cache_control,
+    compress,
+    compressed_cache_stats,
+    content_etag,
+    etag_matches,
+    negotiate_encoding,
+)
+
+
+def _mock_film(mock_swapi):
+    mock_swapi.get("https://swapi.dev/api/films/1/").respond(
+        json={"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+    )
+
+
+def test_etag_matches_weak_comparison_and_lists():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+
+
+def test_cache_control_derived_from_ttl(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "cache_ttl_seconds", 120)
+    monkeypatch.setattr(settings, "cache_stale_while_revalidate_seconds", 30)
+    monkeypatch.setattr(settings, "cache_stale_if_error_seconds", 0)
+    assert cache_control() == "public, max-age=120, stale-while-revalidate=30"
+
+
+def test_resource_response_has_etag_and_cache_control(client, mock_swapi):
+    _mock_film(mock_swapi)
+    response = client.get("/films/1")
+    assert response.status_code == 200
+    assert response.headers["etag"] == content_etag(response.content)
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+
+def test_if_none_match_returns_304(client, mock_swapi):
+    _mock_film(mock_swapi)
+    etag = client.get("/films/1").headers["etag"]
+    response = client.get("/films/1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "content-type" not in response.headers
+
+
+def test_list_response_is_tagged(client, mock_swapi):
+    mock_swapi.get("https://swapi.dev/api/people/").respond(
+        json={"count": 0, "results": [], "next": None, "previous": None}
+    )
+    first = client.get("/people")
+    second = client.get("/people", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+
+
+def test_errors_and_health_are_not_tagged(client, mock_swapi):
+    mock_swapi.get("https://swapi.dev/api/films/99/").respond(404)
+    assert "etag" not in client.get("/films/99").headers
+    assert "etag" not in client.get("/health").headers
+
+
+def _mock_long_film(mock_swapi):
+    mock_swapi.get("https://swapi.dev/api/films/1/").respond(
+        json={"title": "A New Hope", "opening_crawl": "It is a period of civil war. " * 100}
+    )
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding(None) is None
+
+
+def test_large_response_is_gzipped_with_weak_etag(client, mock_swapi):
+    _mock_long_film(mock_swapi)
+    response = client.get("/films/1", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].startswith('W/"')
+    assert response.json()["title"] == "A New Hope"
+    assert int(response.headers["content-length"]) < len(response.content)
+
+
+def test_compressed_body_is_cached_and_revalidates(client, mock_swapi):
+    _mock_long_film(mock_swapi)
+    first = client.get("/films/1", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/films/1", headers={"Accept-Encoding": "gzip"})
+    assert second.content == first.content
+    assert compressed_cache_stats()["hits"] == 1
+    again = client.get(
+        "/films/1",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+    assert again.headers["etag"].startswith("W/")
+    assert "Accept-Encoding" in again.headers["vary"]
+
+
+def test_identity_revalidation_keeps_the_strong_etag(client, mock_swapi):
+    _mock_long_film(mock_swapi)
+    small = client.get("/films/1", headers={"Accept-Encoding": "identity"})
+    again = client.get(
+        "/films/1",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": small.headers["etag"]},
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == small.headers["etag"]
+    assert "Accept-Encoding" in again.headers["vary"]
+
+
+def test_small_or_unaccepted_responses_are_not_compressed(client, mock_swapi):
+    _mock_long_film(mock_swapi)
+    plain = client.get("/films/1", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == content_etag(plain.content)
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_gzip_level_is_configurable(monkeypatch):
+    body = b'{"url": "https://swapi.dev/api/people/1/"}' * 200
+    monkeypatch.setattr(get_settings(), "compression_gzip_level", 1)
+    fast = compress(body, "gzip")
+    monkeypatch.setattr(get_settings(), "compression_gzip_level", 9)
+    assert len(compress(body, "gzip")) <= len(fast)
+    assert gzip.decompress(fast) == body
+
+
+def test_brotli_when_installed(client, mock_swapi):
+    pytest.importorskip("brotli")
+    _mock_long_film(mock_swapi)
+    response = client.get("/films/1", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "br"
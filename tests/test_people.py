@@ -1,21 +1,19 @@
 """Tests for people router."""
 
 import pytest
-import responses
+import respx
 
 
-@responses.activate
+@respx.mock
 def test_list_people(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/",
+    respx.get("https://swapi.dev/api/people/").respond(
+        200,
         json={
             "count": 1,
             "results": [{"name": "Luke Skywalker", "gender": "male"}],
             "next": None,
             "previous": None,
         },
-        status=200,
     )
     r = client.get("/people")
     assert r.status_code == 200
@@ -24,11 +22,10 @@ def test_list_people(client):
     assert data["results"][0]["name"] == "Luke Skywalker"
 
 
-@responses.activate
+@respx.mock
 def test_list_people_with_gender_filter(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/",
+    respx.get("https://swapi.dev/api/people/").respond(
+        200,
         json={
             "count": 2,
             "results": [
@@ -38,7 +35,6 @@ def test_list_people_with_gender_filter(client):
             "next": None,
             "previous": None,
         },
-        status=200,
     )
     r = client.get("/people?gender=female")
     assert r.status_code == 200
@@ -47,31 +43,28 @@ def test_list_people_with_gender_filter(client):
     assert data["results"][0]["gender"] == "female"
 
 
-@responses.activate
+@respx.mock
 def test_get_person_by_id(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/1/",
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200,
         json={"name": "Luke Skywalker", "height": "172", "url": "https://swapi.dev/api/people/1/"},
-        status=200,
     )
     r = client.get("/people/1")
     assert r.status_code == 200
     assert r.json()["name"] == "Luke Skywalker"
 
 
-@responses.activate
+@respx.mock
 def test_get_person_404(client):
-    responses.add(responses.GET, "https://swapi.dev/api/people/999/", status=404)
+    respx.get("https://swapi.dev/api/people/999/").respond(404)
     r = client.get("/people/999")
     assert r.status_code == 404
 
 
-@responses.activate
+@respx.mock
 def test_list_people_with_sort(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/people/",
+    respx.get("https://swapi.dev/api/people/").respond(
+        200,
         json={
             "count": 2,
             "results": [
@@ -81,7 +74,6 @@ def test_list_people_with_sort(client):
             "next": None,
             "previous": None,
         },
-        status=200,
     )
     r = client.get("/people?sort=name&order=asc")
     assert r.status_code == 200
@@ -89,3 +81,112 @@ def test_list_people_with_sort(client):
     # Leia before Luke
     assert data["results"][0]["name"] == "Leia"
     assert data["results"][1]["name"] == "Luke"
+
+
+def _mock_two_pages():
+    # The page-2 route goes first: a route without query params matches any query.
+    respx.get("https://swapi.dev/api/people/?page=2").respond(
+        200,
+        json={
+            "count": 3,
+            "results": [{"name": "Chewbacca", "height": "228", "gender": "male"}],
+            "next": None,
+            "previous": "https://swapi.dev/api/people/?page=1",
+        },
+    )
+    respx.get("https://swapi.dev/api/people/").respond(
+        200,
+        json={
+            "count": 3,
+            "results": [
+                {"name": "Luke", "height": "172", "gender": "male"},
+                {"name": "Leia", "height": "150", "gender": "female"},
+            ],
+            "next": "https://swapi.dev/api/people/?page=2",
+            "previous": None,
+        },
+    )
+
+
+@respx.mock
+def test_list_people_sort_spans_every_page(client):
+    _mock_two_pages()
+    r = client.get("/people?sort=height&order=desc&page_size=2")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["count"] == 3
+    assert [p["name"] for p in data["results"]] == ["Chewbacca", "Luke"]
+    assert data["next"].endswith("/people?sort=height&order=desc&page_size=2&page=2")
+    assert data["previous"] is None
+    r = client.get("/people?sort=height&order=desc&page_size=2&page=2")
+    assert [p["name"] for p in r.json()["results"]] == ["Leia"]
+
+
+@respx.mock
+def test_page_links_stay_on_the_host_the_client_called(client):
+    _mock_two_pages()
+    r = client.get(
+        "/people?sort=height&page_size=2",
+        headers={
+            "Host": "star-wars-fn-abc123.a.run.app",
+            "X-Forwarded-Host": "gateway.example.com",
+            "X-Forwarded-Proto": "https",
+        },
+    )
+    data = r.json()
+    assert data["next"] == "/people?sort=height&page_size=2&page=2"
+    r = client.get(data["next"])
+    assert r.json()["previous"] == "/people?sort=height&page_size=2&page=1"
+
+
+@respx.mock
+def test_list_people_gender_filter_spans_every_page(client):
+    _mock_two_pages()
+    r = client.get("/people?gender=male")
+    assert r.status_code == 200
+    assert [p["name"] for p in r.json()["results"]] == ["Luke", "Chewbacca"]
+
+
+@respx.mock
+def test_list_people_page_out_of_range(client):
+    _mock_two_pages()
+    r = client.get("/people?page_size=10&page=2")
+    assert r.status_code == 404
+
+
+@respx.mock
+def test_get_person_fields_skips_unrequested_relations(client):
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200,
+        json={
+            "name": "Luke Skywalker",
+            "height": "172",
+            "homeworld": "https://swapi.dev/api/planets/1/",
+            "films": ["https://swapi.dev/api/films/1/"],
+        },
+    )
+    planet = respx.get("https://swapi.dev/api/planets/1/").respond(
+        200, json={"name": "Tatooine", "climate": "arid"}
+    )
+    film = respx.get("https://swapi.dev/api/films/1/").respond(200, json={"title": "A New Hope"})
+    r = client.get("/people/1?expand=homeworld,films&fields=name,homeworld.name")
+    assert r.status_code == 200
+    assert r.json() == {"name": "Luke Skywalker", "homeworld": {"name": "Tatooine"}}
+    assert planet.call_count == 1
+    assert film.call_count == 0
+
+
+@respx.mock
+def test_list_people_fields_projects_results(client):
+    respx.get("https://swapi.dev/api/people/").respond(
+        200,
+        json={
+            "count": 1,
+            "results": [{"name": "Luke Skywalker", "gender": "male", "height": "172"}],
+            "next": None,
+            "previous": None,
+        },
+    )
+    data = client.get("/people?fields=name").json()
+    assert data["results"] == [{"name": "Luke Skywalker"}]
+    assert data["count"] == 1
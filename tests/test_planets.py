@@ -1,33 +1,29 @@
 """Tests for planets router."""
 
-import responses
+import respx
 
 
-@responses.activate
+@respx.mock
 def test_list_planets(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/planets/",
+    respx.get("https://swapi.dev/api/planets/").respond(
+        200,
         json={
             "count": 1,
             "results": [{"name": "Tatooine", "population": "200000"}],
             "next": None,
             "previous": None,
         },
-        status=200,
     )
     r = client.get("/planets")
     assert r.status_code == 200
     assert r.json()["results"][0]["name"] == "Tatooine"
 
 
-@responses.activate
+@respx.mock
 def test_get_planet_by_id(client):
-    responses.add(
-        responses.GET,
-        "https://swapi.dev/api/planets/1/",
+    respx.get("https://swapi.dev/api/planets/1/").respond(
+        200,
         json={"name": "Tatooine", "climate": "Arid"},
-        status=200,
     )
     r = client.get("/planets/1")
     assert r.status_code == 200
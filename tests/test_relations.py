@@ -0,0 +1,84 @@
+"""Tests for the relationship index and collection loading."""
+
+import asyncio
+
+import pytest
+import respx
+
+from api.services import catalog, relations
+from api.services.formatters import filter_by_film_id
+from api.services.relations import RelationIndex
+
+BASE = "https://swapi.dev/api"
+
+LUKE = {
+    "name": "Luke Skywalker",
+    "url": f"{BASE}/people/1/",
+    "homeworld": f"{BASE}/planets/1/",
+    "films": [f"{BASE}/films/1/", f"{BASE}/films/2/"],
+}
+NEW_HOPE = {
+    "title": "A New Hope",
+    "url": f"{BASE}/films/1/",
+    "characters": [f"{BASE}/people/1/", f"{BASE}/people/2/"],
+}
+EMPIRE = {"title": "The Empire Strikes Back", "url": f"{BASE}/films/2/", "characters": [f"{BASE}/people/1/"]}
+
+
+def test_index_links_both_directions():
+    index = RelationIndex()
+    index.index_record(LUKE)
+    assert index.related("people", 1, "films") == [1, 2]
+    assert index.related("people", 1, "planets") == [1]
+    assert index.related("films", 1, "people") is None  # film itself not indexed yet
+    index.index_record(NEW_HOPE)
+    assert index.related("films", 1, "people") == [1, 2]
+
+
+def test_reindexing_replaces_old_edges():
+    index = RelationIndex()
+    index.index_record(LUKE)
+    index.index_record({**LUKE, "films": [f"{BASE}/films/1/"]})
+    assert index.related("people", 1, "films") == [1]
+
+
+def _mock_films():
+    # The page-2 route goes first: a route without query params matches any query.
+    respx.get(f"{BASE}/films/?page=2").respond(
+        200,
+        json={"count": 2, "results": [EMPIRE], "next": None, "previous": f"{BASE}/films/?page=1"},
+    )
+    respx.get(f"{BASE}/films/").respond(
+        200,
+        json={"count": 2, "results": [NEW_HOPE], "next": f"{BASE}/films/?page=2", "previous": None},
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aget_collection_crawls_every_page():
+    _mock_films()
+    films = await catalog.aget_collection("films")
+    assert [f["title"] for f in films] == ["A New Hope", "The Empire Strikes Back"]
+    assert catalog.get_record("films", 2)["title"] == "The Empire Strikes Back"
+
+
+@respx.mock
+def test_list_films_by_character_uses_the_index(client):
+    _mock_films()
+    person = respx.get(f"{BASE}/people/1/").respond(200, json=LUKE)
+    asyncio.run(catalog.aget_collection("films"))
+    relations.index.index_record(LUKE)
+    r = client.get("/films?character_id=1")
+    assert r.status_code == 200
+    assert [f["title"] for f in r.json()["results"]] == ["A New Hope", "The Empire Strikes Back"]
+    assert person.call_count == 0
+
+
+def test_filter_by_film_id_matches_exact_ids():
+    items = [
+        {"name": "Luke", "url": f"{BASE}/people/1/", "films": [f"{BASE}/films/1/"]},
+        {"name": "Other", "url": f"{BASE}/people/2/", "films": [f"{BASE}/films/11/"]},
+    ]
+    assert [i["name"] for i in filter_by_film_id(items, 1)] == ["Luke"]
+
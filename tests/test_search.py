@@ -0,0 +1,52 @@
+"""Tests for the local search index."""
+
+import respx
+
+from api.services.search import SearchIndex
+from api.services.snapshot import filter_search
+
+BASE = "https://swapi.dev/api"
+
+PEOPLE = [
+    {"name": "Luke Skywalker", "url": f"{BASE}/people/1/"},
+    {"name": "C-3PO", "url": f"{BASE}/people/2/"},
+    {"name": "Anakin Skywalker", "url": f"{BASE}/people/11/"},
+    {"name": "Obi-Wan Kenobi", "url": f"{BASE}/people/10/"},
+]
+
+
+def test_matches_like_swapi_substring_search():
+    index = SearchIndex("people")
+    index.update(PEOPLE)
+    for query in ("sky", "SKY", "walk", "e sky", "3p", "c-3", "-", "obi-wan k", "nothing"):
+        expected = [p["name"] for p in filter_search("people", PEOPLE, query)]
+        assert [p["name"] for p in index.search(query)] == expected, query
+
+
+def test_results_keep_collection_order():
+    index = SearchIndex("people")
+    index.update(PEOPLE)
+    assert [p["name"] for p in index.search("skywalker")] == ["Luke Skywalker", "Anakin Skywalker"]
+
+
+def test_update_reindexes_only_changed_records():
+    index = SearchIndex("people")
+    assert index.update(PEOPLE) == 4
+    renamed = [{**PEOPLE[0], "name": "Luke"}] + PEOPLE[1:3]
+    assert index.update(renamed) == 1
+    assert index.search("skywalker") == [PEOPLE[2]]
+    assert index.search("kenobi") == []
+
+
+@respx.mock
+def test_list_search_is_answered_locally(client):
+    route = respx.get(f"{BASE}/people/").respond(
+        200,
+        json={"count": 4, "results": PEOPLE, "next": None, "previous": None},
+    )
+    r = client.get("/people?search=walker")
+    assert r.status_code == 200
+    assert [p["name"] for p in r.json()["results"]] == ["Luke Skywalker", "Anakin Skywalker"]
+    r = client.get("/people?search=3po")
+    assert [p["name"] for p in r.json()["results"]] == ["C-3PO"]
+    assert route.call_count == 1
@@ -0,0 +1,94 @@
+"""Tests for the offline snapshot mode."""
+
+import gzip
+import json
+
+import pytest
+import responses
+
+from api.services import swapi_client
+from api.services.snapshot import Snapshot, build_snapshot, split_swapi_url
+from api.services.swapi_client import SWAPINotFoundError
+
+BASE = "https://swapi.dev/api"
+
+PEOPLE = [
+    {"name": f"Person {i}", "url": f"{BASE}/people/{i}/"} for i in range(1, 13)
+] + [{"name": "Luke Skywalker", "url": f"{BASE}/people/13/"}]
+FILMS = [{"title": "A New Hope", "url": f"{BASE}/films/1/"}]
+
+
+@pytest.fixture
+def snapshot_mode(tmp_path, monkeypatch):
+    path = tmp_path / "snapshot.json.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(json.dumps({"resources": {"people": PEOPLE, "films": FILMS}}).encode())
+    settings = swapi_client.get_settings()
+    monkeypatch.setattr(settings, "swapi_mode", "snapshot")
+    monkeypatch.setattr(settings, "swapi_snapshot_path", str(path))
+    monkeypatch.setattr(swapi_client, "_snapshot", None)
+
+
+def test_split_swapi_url():
+    assert split_swapi_url(f"{BASE}/people/1/") == ("people", 1, {})
+    assert split_swapi_url(f"{BASE}/people/?search=luke&page=2") == (
+        "people",
+        None,
+        {"search": "luke", "page": "2"},
+    )
+
+
+@responses.activate
+def test_get_resource_from_snapshot(snapshot_mode):
+    assert swapi_client.get_resource("films", 1)["title"] == "A New Hope"
+    with pytest.raises(SWAPINotFoundError):
+        swapi_client.get_resource("films", 99)
+    assert not responses.calls
+
+
+def test_get_list_pages_like_swapi(snapshot_mode):
+    first = swapi_client.get_list("people")
+    assert first["count"] == 13
+    assert len(first["results"]) == 10
+    assert first["next"] == f"{BASE}/people/?page=2"
+    assert first["previous"] is None
+    second = swapi_client.get_by_url(first["next"])
+    assert [p["name"] for p in second["results"]] == ["Person 11", "Person 12", "Luke Skywalker"]
+    assert second["next"] is None
+    with pytest.raises(SWAPINotFoundError):
+        swapi_client.get_list("people", page=3)
+
+
+@pytest.mark.asyncio
+async def test_search_is_case_insensitive_substring(snapshot_mode):
+    data = await swapi_client.aget_list("people", search="SKY")
+    assert data["count"] == 1
+    assert data["results"][0]["name"] == "Luke Skywalker"
+
+
+def test_router_answers_from_snapshot(snapshot_mode, client):
+    r = client.get("/films/1")
+    assert r.status_code == 200
+    assert r.json()["title"] == "A New Hope"
+    assert client.get("/people/99").status_code == 404
+
+
+@responses.activate
+def test_build_snapshot_crawls_every_page(tmp_path):
+    for resource in ("films", "people", "planets", "species", "starships", "vehicles"):
+        results = PEOPLE[:10] if resource == "people" else []
+        next_url = f"{BASE}/people/?page=2" if resource == "people" else None
+        responses.add(
+            responses.GET,
+            f"{BASE}/{resource}/?page=1",
+            json={"count": len(results), "results": results, "next": next_url, "previous": None},
+        )
+    responses.add(
+        responses.GET,
+        f"{BASE}/people/?page=2",
+        json={"count": 13, "results": PEOPLE[10:], "next": None, "previous": None},
+    )
+    path = str(tmp_path / "snapshot.json.gz")
+    counts = build_snapshot(path)
+    assert counts["people"] == 13
+    assert Snapshot.load(path).get("people", 13)["name"] == "Luke Skywalker"
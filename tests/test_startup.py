@@ -0,0 +1,43 @@
+"""Cold-start guards: lazy transport imports and prewarm.
+
+The wall-clock budget is checked by ``python -m benchmarks.bench_startup
+--budget``, not here: timing limits are noise on slow CI runners.
+"""
+
+import pytest
+import respx
+
+from api.main import prewarm
+from api.services import catalog, swapi_client
+from benchmarks.bench_startup import LAZY_MODULES, import_breakdown
+
+
+def test_importing_main_skips_upstream_transports():
+    loaded = {m["module"].split(".")[0] for m in import_breakdown()}
+    assert "api" in loaded
+    assert loaded.isdisjoint(LAZY_MODULES)
+
+
+@pytest.mark.asyncio
+async def test_prewarm_builds_client_and_loads_collections(monkeypatch):
+    settings = swapi_client.get_settings()
+    monkeypatch.setattr(settings, "prewarm_collections", ("films", "unknown"))
+    with respx.mock:
+        film = {"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+        respx.get("https://swapi.dev/api/films/").respond(
+            json={"count": 1, "results": [film]}
+        )
+        await prewarm()
+    assert catalog.get_record("films", 1)["title"] == "A New Hope"
+    assert swapi_client._async_client is not None
+    await swapi_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_failure_is_not_raised(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "prewarm_collections", ("films",))
+    monkeypatch.setattr(swapi_client.get_settings(), "request_retries", 0)
+    with respx.mock:
+        respx.get("https://swapi.dev/api/films/").respond(503)
+        await prewarm()
+    assert catalog.get_record("films", 1) is None
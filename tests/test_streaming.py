@@ -0,0 +1,97 @@
+"""Tests for NDJSON streaming of correlated results and full collections."""
+
+import json
+
+import respx
+
+from api.services.formatters import MAX_PAGE_SIZE
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def _mock_film_with_characters(ids):
+    respx.get("https://swapi.dev/api/films/1/").respond(
+        json={
+            "title": "A New Hope",
+            "characters": [f"https://swapi.dev/api/people/{i}/" for i in ids],
+        }
+    )
+
+
+@respx.mock
+def test_film_characters_stream_as_ndjson(client):
+    _mock_film_with_characters([1, 2, 3])
+    respx.get("https://swapi.dev/api/people/1/").respond(json={"name": "Luke", "height": "172"})
+    respx.get("https://swapi.dev/api/people/2/").respond(json={"name": "C-3PO", "height": "167"})
+    respx.get("https://swapi.dev/api/people/3/").respond(404)
+    r = client.get("/films/1/characters?stream=1&fields=name")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert "etag" not in r.headers
+    assert sorted(line["name"] for line in _lines(r)) == ["C-3PO", "Luke"]
+    assert all(set(line) == {"name"} for line in _lines(r))
+
+
+@respx.mock
+def test_accept_header_opts_in_and_sort_is_honored(client):
+    _mock_film_with_characters([1, 2])
+    respx.get("https://swapi.dev/api/people/1/").respond(json={"name": "Luke", "height": "172"})
+    respx.get("https://swapi.dev/api/people/2/").respond(json={"name": "C-3PO", "height": "167"})
+    r = client.get(
+        "/films/1/characters?sort=height",
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert [line["name"] for line in _lines(r)] == ["C-3PO", "Luke"]
+
+
+@respx.mock
+def test_routes_negotiating_on_accept_vary_on_it(client):
+    _mock_film_with_characters([1])
+    respx.get("https://swapi.dev/api/people/1/").respond(json={"name": "Luke"})
+    respx.get("https://swapi.dev/api/people/").respond(
+        json={"count": 1, "results": [{"name": "Luke"}], "next": None, "previous": None}
+    )
+    for path in ("/films/1/characters", "/people"):
+        plain = client.get(path)
+        streamed = client.get(path, headers={"Accept": "application/x-ndjson"})
+        assert plain.headers["content-type"] == "application/json"
+        assert streamed.headers["content-type"] == "application/x-ndjson"
+        for response in (plain, streamed):
+            assert "Accept" in [v.strip() for v in response.headers["vary"].split(",")]
+        again = client.get(path, headers={"If-None-Match": plain.headers["etag"]})
+        assert again.status_code == 304
+        assert "Accept" in [v.strip() for v in again.headers["vary"].split(",")]
+
+
+@respx.mock
+def test_films_by_character_stream(client):
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        json={"name": "Luke", "films": ["https://swapi.dev/api/films/1/"]}
+    )
+    respx.get("https://swapi.dev/api/films/1/").respond(json={"title": "A New Hope"})
+    r = client.get("/films?character_id=1&stream=1")
+    assert _lines(r) == [{"title": "A New Hope"}]
+
+
+@respx.mock
+def test_stream_unknown_character_is_404_before_streaming(client):
+    respx.get("https://swapi.dev/api/people/99/").respond(404)
+    r = client.get("/films?character_id=99&stream=1")
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Character not found"
+
+
+@respx.mock
+def test_collection_stream_has_every_record_without_pagination(client):
+    people = [{"name": f"P{i}", "gender": "male" if i % 2 else "female"} for i in range(MAX_PAGE_SIZE + 5)]
+    respx.get("https://swapi.dev/api/people/").respond(
+        json={"count": len(people), "results": people, "next": None, "previous": None}
+    )
+    r = client.get("/people?stream=1&gender=female", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+    lines = _lines(r)
+    assert len(lines) == len([p for p in people if p["gender"] == "female"])
+    assert lines[0]["name"] == "P0"
@@ -1,9 +1,20 @@
 """Unit tests for SWAPI client."""
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import pytest
+import respx
 import responses
 
+from api.services import swapi_client
 from api.services.swapi_client import (
+    aget_by_url,
+    aget_list,
+    aget_many,
+    aget_resource,
     get_resource,
     get_list,
     get_by_url,
@@ -87,3 +98,246 @@ def test_get_resource_502_raises_client_error():
     )
     with pytest.raises(SWAPIClientError):
         get_resource("people", 1)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aget_resource_returns_data():
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200,
+        json={"name": "Luke Skywalker", "url": "https://swapi.dev/api/people/1/"},
+    )
+    data = await aget_resource("people", 1)
+    assert data["name"] == "Luke Skywalker"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aget_resource_404_raises_not_found():
+    respx.get("https://swapi.dev/api/people/999/").respond(404)
+    with pytest.raises(SWAPINotFoundError):
+        await aget_resource("people", 999)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aget_list_with_search():
+    respx.get("https://swapi.dev/api/people/?search=luke").respond(
+        200,
+        json={"count": 1, "results": [{"name": "Luke Skywalker"}], "next": None, "previous": None},
+    )
+    data = await aget_list("people", search="luke")
+    assert data["results"][0]["name"] == "Luke Skywalker"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aget_shares_cache_with_sync_client():
+    route = respx.get("https://swapi.dev/api/films/1/").respond(200, json={"title": "A New Hope"})
+    await aget_by_url("https://swapi.dev/api/films/1/")
+    assert get_by_url("https://swapi.dev/api/films/1/")["title"] == "A New Hope"
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aget_resource_retries_then_raises_client_error(monkeypatch):
+    monkeypatch.setattr(swapi_client, "_BACKOFF_FACTOR", 0)
+    route = respx.get("https://swapi.dev/api/people/1/").respond(502)
+    with pytest.raises(SWAPIClientError):
+        await aget_resource("people", 1)
+    assert route.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_aget_many_bounds_concurrency_and_keeps_order(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "fanout_concurrency", 2)
+    active = 0
+    peak = 0
+
+    async def fake_aget_by_url(url):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01 if url.endswith("1/") else 0)
+        active -= 1
+        return {"url": url}
+
+    monkeypatch.setattr(swapi_client, "aget_by_url", fake_aget_by_url)
+    urls = [f"https://swapi.dev/api/people/{i}/" for i in range(1, 6)]
+    out = await aget_many(urls)
+    assert [o["url"] for o in out] == urls
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_async_misses_share_one_fetch():
+    async def slow_film(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"title": "A New Hope"})
+
+    route = respx.get("https://swapi.dev/api/films/1/").mock(side_effect=slow_film)
+    results = await asyncio.gather(*(aget_resource("films", 1) for _ in range(5)))
+    assert all(r["title"] == "A New Hope" for r in results)
+    assert route.call_count == 1
+    assert swapi_client.client_stats()["coalesced_calls"] == 4
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_coalesced_callers_share_the_error():
+    async def slow_404(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(404)
+
+    route = respx.get("https://swapi.dev/api/people/999/").mock(side_effect=slow_404)
+    results = await asyncio.gather(
+        *(aget_resource("people", 999) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, SWAPINotFoundError) for r in results)
+    assert route.call_count == 1
+
+
+@responses.activate
+def test_concurrent_threaded_misses_share_one_fetch():
+    def slow_person(request):
+        time.sleep(0.05)
+        return (200, {}, '{"name": "Luke Skywalker"}')
+
+    responses.add_callback(
+        responses.GET,
+        "https://swapi.dev/api/people/1/",
+        callback=slow_person,
+    )
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: get_resource("people", 1), range(4)))
+    assert all(r["name"] == "Luke Skywalker" for r in results)
+    assert len(responses.calls) == 1
+    assert swapi_client.client_stats()["coalesced_calls"] == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_stale_while_revalidate_serves_stale_and_refreshes():
+    url = "https://swapi.dev/api/films/1/"
+    swapi_client._cache_set(url, {"title": "Old"}, 0)
+    route = respx.get(url).respond(200, json={"title": "New"})
+    assert (await aget_by_url(url))["title"] == "Old"
+    await asyncio.gather(*swapi_client._background_tasks)
+    assert route.call_count == 1
+    assert (await aget_by_url(url))["title"] == "New"
+    stats = swapi_client.client_stats()
+    assert stats["stale_served"] == 1
+    assert stats["background_refreshes"] == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_stale_if_error_serves_last_good_copy(monkeypatch):
+    monkeypatch.setattr(swapi_client, "_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(swapi_client.get_settings(), "cache_stale_while_revalidate_seconds", 0)
+    url = "https://swapi.dev/api/films/1/"
+    swapi_client._cache_set(url, {"title": "A New Hope"}, 0)
+    respx.get(url).respond(503)
+    assert (await aget_by_url(url))["title"] == "A New Hope"
+    assert swapi_client.client_stats()["stale_if_error_served"] == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_stale_if_error_does_not_mask_404(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "cache_stale_while_revalidate_seconds", 0)
+    url = "https://swapi.dev/api/films/1/"
+    swapi_client._cache_set(url, {"title": "A New Hope"}, 0)
+    respx.get(url).respond(404)
+    with pytest.raises(SWAPINotFoundError):
+        await aget_by_url(url)
+
+
+@responses.activate
+def test_sync_stale_if_error_serves_last_good_copy(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "cache_stale_while_revalidate_seconds", 0)
+    url = "https://swapi.dev/api/people/1/"
+    swapi_client._cache_set(url, {"name": "Luke Skywalker"}, 0)
+    responses.add(responses.GET, url, status=500)
+    assert get_by_url(url)["name"] == "Luke Skywalker"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_404_is_negatively_cached():
+    route = respx.get("https://swapi.dev/api/people/9999/").respond(404)
+    for _ in range(3):
+        with pytest.raises(SWAPINotFoundError):
+            await aget_resource("people", 9999)
+    assert route.call_count == 1
+    assert swapi_client.client_stats()["not_found_hits"] == 2
+
+
+@responses.activate
+def test_sync_404_is_negatively_cached():
+    responses.add(responses.GET, "https://swapi.dev/api/people/9999/", status=404)
+    for _ in range(2):
+        with pytest.raises(SWAPINotFoundError):
+            get_resource("people", 9999)
+    assert len(responses.calls) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_invalid_id_is_not_found_without_upstream_call():
+    with pytest.raises(SWAPINotFoundError):
+        await aget_resource("people", 0)
+    assert not respx.calls
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_expired_entry_is_revalidated_with_etag(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "cache_stale_while_revalidate_seconds", 0)
+    url = "https://swapi.dev/api/films/1/"
+    route = respx.get(url).respond(200, json={"title": "A New Hope"}, headers={"ETag": '"v1"'})
+    film = await aget_by_url(url)
+    swapi_client._cache_entry(url).renew(0, 3600)
+    route.respond(304)
+    assert await aget_by_url(url) is film
+    assert await aget_by_url(url) is film
+    assert route.call_count == 2
+    assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+    assert swapi_client._cache_entry(url).is_valid()
+    assert swapi_client.client_stats()["revalidated"] == 1
+
+
+@responses.activate
+def test_sync_revalidation_uses_last_modified(monkeypatch):
+    monkeypatch.setattr(swapi_client.get_settings(), "cache_stale_while_revalidate_seconds", 0)
+    url = "https://swapi.dev/api/people/1/"
+    modified = "Sat, 20 Dec 2014 21:17:56 GMT"
+    responses.add(
+        responses.GET, url, json={"name": "Luke Skywalker"}, headers={"Last-Modified": modified}
+    )
+    person = get_by_url(url)
+    swapi_client._cache_entry(url).renew(0, 3600)
+    responses.replace(responses.GET, url, status=304)
+    assert get_by_url(url) is person
+    assert responses.calls[-1].request.headers["If-Modified-Since"] == modified
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cancelled_leader_does_not_abort_followers():
+    async def slow_film(request):
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"title": "A New Hope"})
+
+    route = respx.get("https://swapi.dev/api/films/1/").mock(side_effect=slow_film)
+    leader = asyncio.create_task(aget_resource("films", 1))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(aget_resource("films", 1))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert (await follower)["title"] == "A New Hope"
+    assert leader.cancelled()
+    assert route.call_count == 1
@@ -0,0 +1,116 @@
+"""Tests for Server-Timing phases and the opt-in sampling profiler."""
+
+import threading
+import time
+
+import respx
+
+from api.config import get_settings
+from api.services import profiler, timing
+
+
+def _mock_film_with_characters():
+    respx.get("https://swapi.dev/api/films/2/").respond(
+        json={
+            "title": "The Empire Strikes Back",
+            "characters": ["https://swapi.dev/api/people/1/", "https://swapi.dev/api/people/2/"],
+        }
+    )
+    respx.get("https://swapi.dev/api/people/1/").respond(json={"name": "Luke Skywalker"})
+    respx.get("https://swapi.dev/api/people/2/").respond(json={"name": "C-3PO"})
+
+
+def _phases(header):
+    return {part.split(";")[0].strip(): part for part in header.split(",")}
+
+
+def test_server_timing_value_format():
+    timings = timing.RequestTimings()
+    timings.add("sort", 0.0015)
+    timings.add("custom", 0.001)
+    assert timings.server_timing(0.01) == (
+        'upstream;dur=0.00;desc="0 calls", sort;dur=1.50, custom;dur=1.00, app;dur=10.00'
+    )
+
+
+def test_phase_outside_a_request_is_a_noop():
+    with timing.phase("sort"):
+        pass
+    assert timing.current() is None
+
+
+@respx.mock
+def test_expand_request_reports_phases_and_upstream_calls(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "server_timing", True)
+    _mock_film_with_characters()
+    r = client.get("/films/2?expand=characters")
+    phases = _phases(r.headers["server-timing"])
+    assert set(phases) >= {"cache", "upstream", "expand", "serialize", "app"}
+    assert 'desc="3 calls"' in phases["upstream"]
+    cached = _phases(client.get("/films/2?expand=characters").headers["server-timing"])
+    assert 'desc="0 calls"' in cached["upstream"]
+
+
+@respx.mock
+def test_server_timing_is_off_by_default(client):
+    assert get_settings().server_timing is False
+    _mock_film_with_characters()
+    assert "server-timing" not in client.get("/films/2").headers
+
+
+@respx.mock
+def test_profile_token_writes_call_tree(client, monkeypatch, tmp_path):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profile_token", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profile_interval_ms", 1)
+    _mock_film_with_characters()
+    assert "x-profile" not in client.get("/films/2", headers={"X-Profile-Token": "wrong"}).headers
+    r = client.get("/films/2?expand=characters", headers={"X-Profile-Token": "s3cret"})
+    profile = (tmp_path / r.headers["x-profile"]).read_text()
+    assert profile.startswith("GET /films/2?expand=characters\n")
+    assert "samples every 1 ms" in profile
+    assert list(tmp_path.iterdir()) == [tmp_path / r.headers["x-profile"]]
+
+
+@respx.mock
+def test_profiles_are_capped_per_process(client, monkeypatch, tmp_path):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profile_token", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profile_max_files", 2)
+    _mock_film_with_characters()
+    names = [
+        client.get("/films/2", headers={"X-Profile-Token": "s3cret"}).headers["x-profile"]
+        for _ in range(3)
+    ]
+    # Token-requested profiles rotate out the oldest one.
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(names[1:])
+    # Random sampling stops once the budget is used.
+    monkeypatch.setattr(settings, "profile_token", "")
+    monkeypatch.setattr(settings, "profile_sample_rate", 1.0)
+    assert not profiler.selected({}, settings)
+    assert "x-profile" not in client.get("/films/2").headers
+
+
+def test_sample_rate_selects_requests(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profile_token", "")
+    monkeypatch.setattr(settings, "profile_sample_rate", 1.0)
+    assert profiler.selected({}, settings)
+    monkeypatch.setattr(settings, "profile_sample_rate", 0.0)
+    assert not profiler.selected({}, settings)
+
+
+def test_sampling_profiler_builds_call_tree():
+    def busy_wait_for_profiler():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    sampler = profiler.SamplingProfiler(threading.get_ident(), 0.001)
+    sampler.start()
+    busy_wait_for_profiler()
+    sampler.stop()
+    assert sampler.samples > 0
+    assert "busy_wait_for_profiler" in sampler.render()